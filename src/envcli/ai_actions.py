@@ -7,12 +7,18 @@ while preserving all sensitive values.
 
 import json
 import re
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
 from .env_manager import EnvManager
 from .config import CONFIG_DIR
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 ACTIONS_LOG_FILE = CONFIG_DIR / "ai_actions_log.json"
 AI_RULES_FILE = CONFIG_DIR / "ai_rules.json"
 
@@ -52,6 +58,8 @@ class AIActionExecutor:
         self.manager = EnvManager(profile)
         self.actions: List[AIAction] = []
         self.custom_rules = self._load_custom_rules()
+        self._batch_depth = 0
+        self._rules_dirty = False
     
     def parse_recommendations(self, recommendations: str) -> List[AIAction]:
         """
@@ -317,6 +325,8 @@ class AIActionExecutor:
     def _load_custom_rules(self) -> Dict[str, Any]:
         """Load custom AI action rules."""
         if AI_RULES_FILE.exists():
+            if orjson is not None:
+                return orjson.loads(AI_RULES_FILE.read_bytes())
             with open(AI_RULES_FILE, 'r') as f:
                 return json.load(f)
         return {
@@ -328,11 +338,39 @@ class AIActionExecutor:
         }
 
     def _save_custom_rules(self):
-        """Save custom rules to file."""
+        """Save custom rules to file, or defer the write while batching."""
+        if self._batch_depth:
+            self._rules_dirty = True
+            return
         AI_RULES_FILE.parent.mkdir(exist_ok=True)
+        if orjson is not None:
+            AI_RULES_FILE.write_bytes(orjson.dumps(self.custom_rules, option=orjson.OPT_INDENT_2))
+            return
         with open(AI_RULES_FILE, 'w') as f:
             json.dump(self.custom_rules, f, indent=2)
 
+    @contextmanager
+    def batch(self):
+        """
+        Defer rule persistence until the block exits.
+
+        Adding several rules inside ``with executor.batch():`` writes
+        ai_rules.json once instead of once per rule.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._rules_dirty:
+                self._rules_dirty = False
+                self._save_custom_rules()
+
+    def _append_rule(self, category: str, rule: Dict[str, Any]):
+        """Append a rule to a category and persist it."""
+        self.custom_rules[category].append(rule)
+        self._save_custom_rules()
+
     def add_naming_rule(self, pattern: str, target_format: str, description: str = ""):
         """
         Add a custom naming rule.
@@ -349,8 +387,7 @@ class AIActionExecutor:
             "description": description,
             "created_at": datetime.now().isoformat()
         }
-        self.custom_rules["naming_rules"].append(rule)
-        self._save_custom_rules()
+        self._append_rule("naming_rules", rule)
 
     def add_prefix_rule(self, pattern: str, prefix: str, description: str = ""):
         """
@@ -368,8 +405,7 @@ class AIActionExecutor:
             "description": description,
             "created_at": datetime.now().isoformat()
         }
-        self.custom_rules["prefix_rules"].append(rule)
-        self._save_custom_rules()
+        self._append_rule("prefix_rules", rule)
 
     def add_transformation_rule(self, pattern: str, transformation: str, description: str = ""):
         """
@@ -387,8 +423,7 @@ class AIActionExecutor:
             "description": description,
             "created_at": datetime.now().isoformat()
         }
-        self.custom_rules["transformation_rules"].append(rule)
-        self._save_custom_rules()
+        self._append_rule("transformation_rules", rule)
 
     def add_exclusion(self, pattern: str, description: str = ""):
         """
@@ -403,8 +438,7 @@ class AIActionExecutor:
             "description": description,
             "created_at": datetime.now().isoformat()
         }
-        self.custom_rules["exclusions"].append(exclusion)
-        self._save_custom_rules()
+        self._append_rule("exclusions", exclusion)
 
     def list_custom_rules(self) -> Dict[str, Any]:
         """List all custom rules."""
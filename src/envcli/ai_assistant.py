@@ -10,8 +10,28 @@ from .config import CONFIG_DIR
 from .env_manager import EnvManager
 from .ai_providers import get_provider, AIProvider
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 AI_CONFIG_FILE = CONFIG_DIR / "ai_config.json"
 
+
+def _dumps_config(config: Dict[str, Any]) -> str:
+    """Serialize AI config to indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(config, indent=2)
+
+
+def _loads_config(text: str) -> Dict[str, Any]:
+    """Parse AI config JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 class AIAssistant:
     """AI-powered assistant for environment variable analysis."""
 
@@ -23,16 +43,14 @@ class AIAssistant:
     def _check_ai_enabled(self) -> bool:
         """Check if AI features are enabled."""
         if AI_CONFIG_FILE.exists():
-            with open(AI_CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                return config.get("enabled", False)
+            config = _loads_config(AI_CONFIG_FILE.read_text())
+            return config.get("enabled", False)
         return False
 
     def _load_config(self) -> Dict[str, Any]:
         """Load AI configuration."""
         if AI_CONFIG_FILE.exists():
-            with open(AI_CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            return _loads_config(AI_CONFIG_FILE.read_text())
         return {
             "enabled": False,
             "provider": "pattern-matching",
@@ -66,8 +84,7 @@ class AIAssistant:
         }
 
         AI_CONFIG_FILE.parent.mkdir(exist_ok=True)
-        with open(AI_CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        AI_CONFIG_FILE.write_text(_dumps_config(config))
 
         self.enabled = True
         self.config = config
@@ -78,8 +95,7 @@ class AIAssistant:
         if AI_CONFIG_FILE.exists():
             config = self.config.copy()
             config["enabled"] = False
-            with open(AI_CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
+            AI_CONFIG_FILE.write_text(_dumps_config(config))
         self.enabled = False
         self.provider = None
 
@@ -104,8 +120,7 @@ class AIAssistant:
             self.config["last_updated"] = datetime.now().isoformat()
 
             AI_CONFIG_FILE.parent.mkdir(exist_ok=True)
-            with open(AI_CONFIG_FILE, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            AI_CONFIG_FILE.write_text(_dumps_config(self.config))
 
             self.provider = test_provider
 
@@ -145,7 +160,8 @@ class AIAssistant:
             "enabled": self.enabled,
             "current_provider": current_provider,
             "current_model": current_model,
-            "providers": available_providers
+            "providers": available_providers,
+            "providers_by_name": {p["name"]: p for p in available_providers}
         }
 
     def analyze_variable_naming(self, profile: str) -> List[Dict[str, Any]]:
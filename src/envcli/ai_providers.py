@@ -383,8 +383,17 @@ class PatternMatchingProvider(AIProvider):
         return "\n".join(recommendations)
 
 
+# Pattern matching has no configuration or external state, so one instance
+# serves every lookup. The other providers read API keys or probe Ollama when
+# built, so they are constructed fresh each time.
+_SHARED_PROVIDERS = {"pattern-matching": PatternMatchingProvider()}
+
+
 def get_provider(provider_name: str, **kwargs) -> AIProvider:
     """Factory function to get an AI provider instance."""
+    if not kwargs and provider_name.lower() in _SHARED_PROVIDERS:
+        return _SHARED_PROVIDERS[provider_name.lower()]
+
     providers = {
         "openai": OpenAIProvider,
         "anthropic": AnthropicProvider,
@@ -1,36 +1,113 @@
 import json
 import os
-import yaml
+from collections import Counter, deque
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Final, Iterator, List, Mapping
 
 CONFIG_DIR = Path.home() / ".envcli"
-CONFIG_FILE = CONFIG_DIR / "config.yaml"
+CONFIG_FILE = CONFIG_DIR / "config.json"
+LEGACY_CONFIG_FILE = CONFIG_DIR / "config.yaml"
 PROFILES_DIR = CONFIG_DIR / "profiles"
 
-DEFAULT_CONFIG = {
+# Read-only; load_config hands out dict(DEFAULT_CONFIG) copies
+DEFAULT_CONFIG: Final[Mapping[str, Any]] = MappingProxyType({
     "default_profile": "dev",
     "remember_last_profile": True,
-}
+})
+
+# Number of commands kept in the analytics history
+COMMAND_HISTORY_LIMIT = 100
+
+# Last read config file contents, keyed on (path, mtime, size) so unchanged files aren't re-read
+_CONFIG_CACHE = {"key": None, "text": None}
+
+# Config dict of the open config_transaction(), if any; updates go to it instead of disk
+_TRANSACTION = {"config": None}
+
+# (CONFIG_DIR, PROFILES_DIR) already created by ensure_config_dir in this process
+_ENSURED_DIRS = {"dirs": None}
 
 def ensure_config_dir():
     """Ensure the config directory exists."""
+    # Only the first call per directory pair needs the mkdir syscalls
+    dirs = (CONFIG_DIR, PROFILES_DIR)
+    if _ENSURED_DIRS["dirs"] == dirs:
+        return
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS["dirs"] = dirs
+
+def _reset_ensured():
+    """Make the next ensure_config_dir() call create the directories again."""
+    _ENSURED_DIRS["dirs"] = None
+
+def _migrate_legacy_config() -> Dict[str, Any]:
+    """Convert a config.yaml written by older versions to config.json, once.
+
+    The YAML file is kept as config.yaml.bak. PyYAML is only imported here.
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    with open(LEGACY_CONFIG_FILE, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=SafeLoader) or dict(DEFAULT_CONFIG)
+    save_config(config)
+    LEGACY_CONFIG_FILE.rename(LEGACY_CONFIG_FILE.with_name(LEGACY_CONFIG_FILE.name + ".bak"))
+    return config
 
 def load_config() -> Dict[str, Any]:
     """Load global configuration."""
     ensure_config_dir()
     if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, 'r') as f:
-            return yaml.safe_load(f) or DEFAULT_CONFIG
-    return DEFAULT_CONFIG.copy()
+        stat = CONFIG_FILE.stat()
+        key = (CONFIG_FILE, stat.st_mtime_ns, stat.st_size)
+        if _CONFIG_CACHE["key"] != key:
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                _CONFIG_CACHE["key"], _CONFIG_CACHE["text"] = key, f.read()
+        # Callers mutate the result before saving it, so each one gets a freshly
+        # parsed dict; json.loads is cheaper than deep-copying a cached one
+        try:
+            return json.loads(_CONFIG_CACHE["text"]) or dict(DEFAULT_CONFIG)
+        except json.JSONDecodeError:
+            return dict(DEFAULT_CONFIG)
+    if LEGACY_CONFIG_FILE.exists():
+        return _migrate_legacy_config()
+    return dict(DEFAULT_CONFIG)
 
 def save_config(config: Dict[str, Any]):
     """Save global configuration."""
     ensure_config_dir()
-    with open(CONFIG_FILE, 'w') as f:
-        yaml.dump(config, f)
+    _CONFIG_CACHE["key"] = None
+    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+
+@contextmanager
+def config_transaction() -> Iterator[Dict[str, Any]]:
+    """Load the config once, apply every update made inside the block, and save once on exit.
+
+    Nested transactions share the outermost one. Nothing is saved if the block raises.
+    """
+    if _TRANSACTION["config"] is not None:
+        yield _TRANSACTION["config"]
+        return
+
+    config = load_config()
+    _TRANSACTION["config"] = config
+    try:
+        yield config
+    finally:
+        _TRANSACTION["config"] = None
+    save_config(config)
+
+def update_config(mutator: Callable[[Dict[str, Any]], None]):
+    """Apply ``mutator`` to the config with a single load and save."""
+    with config_transaction() as config:
+        mutator(config)
 
 def get_current_profile() -> str:
     """Get the current active profile."""
@@ -39,26 +116,29 @@ def get_current_profile() -> str:
 
 def set_current_profile(profile: str):
     """Set the current active profile."""
-    config = load_config()
-    config["current_profile"] = profile
-    save_config(config)
+    with config_transaction() as config:
+        config["current_profile"] = profile
 
 def list_profiles() -> List[str]:
     """List all available profiles."""
     ensure_config_dir()
-    profiles = []
-    for file in PROFILES_DIR.glob("*.json"):
-        profiles.append(file.stem)
+    with os.scandir(PROFILES_DIR) as entries:
+        profiles = [
+            entry.name[:-len(".json")] for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
     return sorted(profiles)
 
 def create_profile(name: str):
     """Create a new profile."""
     ensure_config_dir()
     profile_file = PROFILES_DIR / f"{name}.json"
-    if profile_file.exists():
+    # Exclusive create checks for an existing profile and creates the file in one atomic step
+    try:
+        with open(profile_file, 'x') as f:
+            json.dump({}, f)
+    except FileExistsError:
         raise ValueError(f"Profile '{name}' already exists")
-    with open(profile_file, 'w') as f:
-        json.dump({}, f)
 
 def list_hooks() -> List[Dict[str, str]]:
     """List all configured hooks."""
@@ -67,26 +147,21 @@ def list_hooks() -> List[Dict[str, str]]:
 
 def add_hook(hook_type: str, command: str, hook_command: str):
     """Add a hook."""
-    config = load_config()
-    if "hooks" not in config:
-        config["hooks"] = []
-    config["hooks"].append({
-        "type": hook_type,
-        "command": command,
-        "hook_command": hook_command
-    })
-    save_config(config)
+    with config_transaction() as config:
+        config.setdefault("hooks", []).append({
+            "type": hook_type,
+            "command": command,
+            "hook_command": hook_command
+        })
 
 def remove_hook(index: int):
     """Remove a hook by index."""
-    config = load_config()
-    hooks = config.get("hooks", [])
-    if 0 <= index < len(hooks):
+    with config_transaction() as config:
+        hooks = config.get("hooks", [])
+        if not 0 <= index < len(hooks):
+            raise ValueError(f"Hook index {index} out of range")
         hooks.pop(index)
         config["hooks"] = hooks
-        save_config(config)
-    else:
-        raise ValueError(f"Hook index {index} out of range")
 
 def is_analytics_enabled() -> bool:
     """Check if analytics is enabled."""
@@ -95,32 +170,58 @@ def is_analytics_enabled() -> bool:
 
 def set_analytics_enabled(enabled: bool):
     """Enable or disable analytics."""
-    config = load_config()
-    config["analytics_enabled"] = enabled
-    save_config(config)
+    with config_transaction() as config:
+        config["analytics_enabled"] = enabled
+
+def _command_prefix(command: str) -> str:
+    """Top-level command name used to group analytics stats."""
+    # maxsplit=1 stops scanning after the first word
+    parts = command.split(maxsplit=1) if command else None
+    return parts[0] if parts else "unknown"
+
+def _count_commands(history: List[Dict[str, str]]) -> Dict[str, int]:
+    """Tally command prefixes over a command history."""
+    return dict(Counter(_command_prefix(entry.get("command")) for entry in history))
 
 def log_command(command: str):
     """Log a command execution."""
-    if not is_analytics_enabled():
+    # One read serves both the analytics check and the update. Inside an open
+    # transaction, work on its config so its pending changes aren't overwritten.
+    in_transaction = _TRANSACTION["config"] is not None
+    config = _TRANSACTION["config"] if in_transaction else load_config()
+    if not config.get("analytics_enabled", False):
         return
 
-    config = load_config()
-    if "command_history" not in config:
-        config["command_history"] = []
-    config["command_history"].append({
+    # The bounded deque drops the oldest entries as new ones are appended
+    history = deque(config.get("command_history", []), maxlen=COMMAND_HISTORY_LIMIT)
+    # Stats mirror the retained history, so they're updated alongside it
+    stats = config.get("command_stats")
+    if stats is None:
+        stats = _count_commands(history)
+    if len(history) == history.maxlen:
+        # Counted the same way as _count_commands, so entries without a command
+        # (legacy or hand-edited) don't break logging
+        evicted = _command_prefix(history[0].get("command"))
+        remaining = stats.get(evicted, 0) - 1
+        if remaining > 0:
+            stats[evicted] = remaining
+        else:
+            stats.pop(evicted, None)
+    history.append({
         "command": command,
         "timestamp": str(__import__("datetime").datetime.now())
     })
-    # Keep only last 100 commands
-    config["command_history"] = config["command_history"][-100:]
-    save_config(config)
+    prefix = _command_prefix(command)
+    stats[prefix] = stats.get(prefix, 0) + 1
+    config["command_history"] = list(history)
+    config["command_stats"] = stats
+    if not in_transaction:
+        save_config(config)
 
 def get_command_stats() -> Dict[str, int]:
     """Get command usage statistics."""
     config = load_config()
-    history = config.get("command_history", [])
-    stats = {}
-    for entry in history:
-        cmd = entry["command"].split()[0] if entry["command"] else "unknown"
-        stats[cmd] = stats.get(cmd, 0) + 1
-    return stats
+    if "command_stats" in config:
+        return dict(config["command_stats"])
+    # Configs written before stats were tracked only have the history
+    return _count_commands(config.get("command_history", []))
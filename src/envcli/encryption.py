@@ -1,21 +1,123 @@
+import base64
 import os
+import shutil
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from cryptography.fernet import Fernet
+from typing import BinaryIO, Callable, Dict, List
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from .config import CONFIG_DIR
 
 KEY_FILE = CONFIG_DIR / "key"
 
+# Encrypted files start with this header: chunk size, nonce prefix, then a
+# sequence of AES-GCM chunks. The leading NUL keeps them from ever parsing as
+# text/JSON or a Fernet token.
+STREAM_HEADER = b"\x00envcli-gcm2"
+TAG_SIZE = 16
+
+# Streamed files are encrypted in chunks of this many plaintext bytes. Each
+# chunk's nonce is the file's random prefix, the chunk counter and a final-chunk
+# flag, so reordered, dropped or truncated chunks fail authentication.
+CHUNK_SIZE = 64 * 1024
+_NONCE_PREFIX_SIZE = 7
+_CHUNK_SIZE_FORMAT = ">I"
+
+@lru_cache(maxsize=1)
 def get_or_create_key() -> bytes:
-    """Get existing key or create a new one."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    if KEY_FILE.exists():
+    """Get existing key or create a new one.
+
+    The key is read once per process; call ``get_or_create_key.cache_clear()``
+    after replacing or deleting KEY_FILE.
+    """
+    # Open directly rather than mkdir + exists() first: loading an existing key
+    # is the common case and needs no extra syscalls
+    try:
         with open(KEY_FILE, 'rb') as f:
             return f.read()
-    else:
-        key = Fernet.generate_key()
-        with open(KEY_FILE, 'wb') as f:
-            f.write(key)
-        return key
+    except FileNotFoundError:
+        pass
+
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    key = Fernet.generate_key()
+    with open(KEY_FILE, 'wb') as f:
+        f.write(key)
+    return key
+
+def _aesgcm(key: bytes) -> AESGCM:
+    """AES-256-GCM cipher for a key file (url-safe base64 of 32 random bytes)."""
+    return AESGCM(base64.urlsafe_b64decode(key))
+
+def _chunk_nonce(prefix: bytes, counter: int, final: bool) -> bytes:
+    """Nonce for one stream chunk: prefix || 32-bit counter || final flag."""
+    if counter >= 2 ** 32:
+        raise ValueError("File too large to encrypt")
+    return prefix + struct.pack(">IB", counter, final)
+
+def _encrypt_stream(src: BinaryIO, dst: BinaryIO, cipher: AESGCM, chunk_size: int):
+    prefix = os.urandom(_NONCE_PREFIX_SIZE)
+    dst.write(STREAM_HEADER + struct.pack(_CHUNK_SIZE_FORMAT, chunk_size) + prefix)
+
+    # Read one chunk ahead so the last chunk (possibly empty) can be flagged final
+    chunk = src.read(chunk_size)
+    counter = 0
+    while True:
+        next_chunk = src.read(chunk_size) if len(chunk) == chunk_size else b""
+        final = not next_chunk
+        dst.write(cipher.encrypt(_chunk_nonce(prefix, counter, final), chunk, None))
+        if final:
+            return
+        chunk = next_chunk
+        counter += 1
+
+def encrypt_stream(src: BinaryIO, dst: BinaryIO, key: bytes, chunk_size: int = CHUNK_SIZE):
+    """Encrypt binary stream ``src`` into ``dst``, holding one chunk in memory at a time."""
+    _encrypt_stream(src, dst, _aesgcm(key), chunk_size)
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO, key: bytes):
+    """Decrypt a stream written by encrypt_stream into ``dst``.
+
+    Raises ValueError for a missing header and InvalidTag for a wrong key or
+    tampered/truncated data; ``dst`` may already hold earlier chunks by then.
+    """
+    if src.read(len(STREAM_HEADER)) != STREAM_HEADER:
+        raise ValueError("Not an envcli encrypted stream")
+    (chunk_size,) = struct.unpack(_CHUNK_SIZE_FORMAT, src.read(struct.calcsize(_CHUNK_SIZE_FORMAT)))
+    prefix = src.read(_NONCE_PREFIX_SIZE)
+    cipher = _aesgcm(key)
+
+    block_size = chunk_size + TAG_SIZE
+    block = src.read(block_size)
+    counter = 0
+    while True:
+        next_block = src.read(block_size) if len(block) == block_size else b""
+        final = not next_block
+        dst.write(cipher.decrypt(_chunk_nonce(prefix, counter, final), block, None))
+        if final:
+            return
+        block = next_block
+        counter += 1
+
+def _rewrite(path: Path, suffix: str, transform: Callable[[BinaryIO, BinaryIO], None]):
+    """Stream ``path`` through ``transform`` into a sibling temp file, then swap it in."""
+    # Replace the real file, not the link, so a symlinked profile keeps pointing
+    # at its (now rewritten) target
+    path = Path(os.path.realpath(path))
+    # A unique name, so an unrelated file such as "<name>.enc" is never clobbered
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=suffix)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, 'wb') as dst, open(path, 'rb') as src:
+            transform(src, dst)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 def encrypt_file(file_path: str):
     """Encrypt a file."""
@@ -23,16 +125,36 @@ def encrypt_file(file_path: str):
     if not path.exists():
         raise FileNotFoundError(f"File {file_path} not found")
 
-    key = get_or_create_key()
-    fernet = Fernet(key)
+    _encrypt_path(path, _aesgcm(get_or_create_key()))
 
-    with open(path, 'rb') as f:
-        data = f.read()
+def _encrypt_path(path: Path, cipher: AESGCM):
+    """Encrypt one file in place with an already-built cipher."""
+    _rewrite(path, ".enc", lambda src, dst: _encrypt_stream(src, dst, cipher, CHUNK_SIZE))
 
-    encrypted = fernet.encrypt(data)
+def encrypt_files(file_paths: List[str]) -> Dict[str, Exception]:
+    """Encrypt several files with one key load, overlapping their I/O on a thread pool.
 
-    with open(path, 'wb') as f:
-        f.write(encrypted)
+    Duplicate paths are encrypted once. Returns the files that could not be
+    encrypted, mapped to the error raised for each.
+    """
+    # Two workers on the same file would race on its contents
+    paths = list(dict.fromkeys(map(Path, file_paths)))
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"File {path} not found")
+    if not paths:
+        return {}
+
+    cipher = _aesgcm(get_or_create_key())
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {path: executor.submit(_encrypt_path, path, cipher) for path in paths}
+    errors = {}
+    for path, future in futures.items():
+        error = future.exception()
+        if error is not None:
+            errors[str(path)] = error
+    return errors
 
 def decrypt_file(file_path: str):
     """Decrypt a file."""
@@ -41,14 +163,20 @@ def decrypt_file(file_path: str):
         raise FileNotFoundError(f"File {file_path} not found")
 
     key = get_or_create_key()
-    fernet = Fernet(key)
 
     with open(path, 'rb') as f:
-        data = f.read()
+        streamed = f.read(len(STREAM_HEADER)) == STREAM_HEADER
+    if streamed:
+        try:
+            _rewrite(path, ".dec", lambda src, dst: decrypt_stream(src, dst, key))
+        except (InvalidTag, ValueError, struct.error):
+            raise ValueError("Failed to decrypt file. Wrong key or not encrypted.")
+        return
 
+    # Files encrypted by earlier versions are single Fernet tokens
     try:
-        decrypted = fernet.decrypt(data)
-    except Exception:
+        decrypted = Fernet(key).decrypt(path.read_bytes())
+    except (InvalidToken, ValueError):
         raise ValueError("Failed to decrypt file. Wrong key or not encrypted.")
 
     with open(path, 'wb') as f:
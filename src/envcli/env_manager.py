@@ -6,6 +6,12 @@ from dotenv import load_dotenv, dotenv_values
 import yaml
 from .config import PROFILES_DIR, get_current_profile
 
+# Prefer libyaml's C loader and dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
 class EnvManager:
     def __init__(self, profile: Optional[str] = None):
         self.profile = profile or get_current_profile()
@@ -13,13 +19,10 @@ class EnvManager:
 
     def load_env(self) -> Dict[str, str]:
         """Load environment variables from profile."""
-        if not self.profile_file.exists():
+        content = self._read_file()
+        if content is None:
             return {}
 
-        # Read file content
-        with open(self.profile_file, 'rb') as f:
-            content = f.read()
-
         # Try to decode as plain JSON first
         try:
             data = json.loads(content.decode('utf-8'))
@@ -58,11 +61,22 @@ class EnvManager:
 
     def save_env(self, env_vars: Dict[str, str]):
         """Save environment variables to profile."""
+        json_data = json.dumps(env_vars, indent=2)
+        self._write_file(json_data.encode('utf-8'))
+
+    def _read_file(self) -> Optional[bytes]:
+        """Raw profile file contents, or None if the profile has no file yet."""
+        if not self.profile_file.exists():
+            return None
+        with open(self.profile_file, 'rb') as f:
+            return f.read()
+
+    def _write_file(self, data: bytes):
+        """Replace the profile file's contents."""
         PROFILES_DIR.mkdir(parents=True, exist_ok=True)
         # Use binary mode to handle encrypted files later
         with open(self.profile_file, 'wb') as f:
-            json_data = json.dumps(env_vars, indent=2)
-            f.write(json_data.encode('utf-8'))
+            f.write(data)
 
     def list_env(self, mask: bool = True) -> Dict[str, str]:
         """List all environment variables."""
@@ -104,7 +118,7 @@ class EnvManager:
                 env_vars = json.load(f)
         elif format == "yaml":
             with open(path, 'r') as f:
-                env_vars = yaml.safe_load(f)
+                env_vars = yaml.load(f, Loader=SafeLoader)
         else:
             raise ValueError(f"Unsupported format: {format}")
 
@@ -125,8 +139,10 @@ class EnvManager:
             with open(path, 'w') as f:
                 json.dump(env_vars, f, indent=2)
         elif format == "yaml":
-            with open(path, 'w') as f:
-                yaml.dump(env_vars, f)
+            # Keep the profile's key order and write non-ASCII values as-is
+            with open(path, 'w', encoding='utf-8') as f:
+                yaml.dump(env_vars, f, Dumper=SafeDumper, default_flow_style=False,
+                          sort_keys=False, allow_unicode=True)
         elif format == "shell":
             with open(path, 'w') as f:
                 for k, v in env_vars.items():
@@ -10,7 +10,7 @@ from textual.message import Message
 from textual.screen import ModalScreen
 from rich.text import Text
 
-from ...encryption import encrypt_file, decrypt_file, get_or_create_key, KEY_FILE
+from ...encryption import encrypt_file, encrypt_files, decrypt_file, get_or_create_key, KEY_FILE
 from ...config import get_current_profile, PROFILES_DIR
 from ...env_manager import EnvManager
 
@@ -249,6 +249,7 @@ class KeyManager(Container):
                 KEY_FILE.unlink()
             
             # Generate new key
+            get_or_create_key.cache_clear()
             get_or_create_key()
             
             self.app.notify("+ New encryption key generated", severity="information")
@@ -299,6 +300,7 @@ class KeyManager(Container):
             # Perform the restore
             import shutil
             shutil.copy2(latest_backup, KEY_FILE)
+            get_or_create_key.cache_clear()
             
             self.app.notify("✅ Key restored successfully", severity="success")
             self.post_message(self.KeyRegenerated())
@@ -422,7 +424,7 @@ class EncryptionScreen(Container):
         info = Text()
         info.append("🔐 Encryption Method\n", style="bold #00E676")
         info.append("Algorithm: ", style="#757575")
-        info.append("Fernet (AES-128-CBC + HMAC)\n", style="#64FFDA")
+        info.append("AES-256-GCM\n", style="#64FFDA")
         info.append("Key Size: ", style="#757575")
         info.append("256 bits\n\n", style="#64FFDA")
         
@@ -1100,6 +1102,7 @@ padding: 2;
             
             success_count = 0
             failed_files = []
+            to_encrypt = []
             
             for file_name in files:
                 try:
@@ -1111,16 +1114,24 @@ padding: 2;
                         import shutil
                         shutil.copy2(file_path, backup_path)
                     
-                    # Perform operation
+                    # Perform operation; encryption runs as one batch below
                     if self.operation == "encrypt":
-                        encrypt_file(str(file_path))
-                    else:
-                        decrypt_file(str(file_path))
+                        to_encrypt.append(str(file_path))
+                        continue
+                    decrypt_file(str(file_path))
                     
                     success_count += 1
                 except Exception as e:
                     failed_files.append(f"{file_name}: {str(e)}")
             
+            if to_encrypt:
+                try:
+                    errors = encrypt_files(to_encrypt)
+                except Exception as e:
+                    errors = {file_path: e for file_path in to_encrypt}
+                success_count += len(to_encrypt) - len(errors)
+                failed_files.extend(f"{Path(file_path).name}: {str(e)}" for file_path, e in errors.items())
+            
             # Show results
             if failed_files:
                 failed_msg = f"⚠️ {success_count}/{len(files)} files processed. Failed: " + "; ".join(failed_files[:3])
@@ -3,14 +3,15 @@ Theme system for EnvCLI TUI with multiple selectable themes
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict
 from pathlib import Path
 import json
 
 
-@dataclass
+@dataclass(frozen=True)
 class ThemeColors:
-    """Color scheme for a theme."""
+    """Color scheme for a theme (immutable, so it can key the CSS cache)."""
     # Main colors
     background: str
     surface: str
@@ -256,8 +257,9 @@ class ThemeManager:
         return list(THEMES.keys())
 
 
+@lru_cache(maxsize=None)
 def generate_css(colors: ThemeColors) -> str:
-    """Generate CSS from theme colors."""
+    """Generate CSS from theme colors (cached per color scheme)."""
     return f"""
 Screen {{
     background: {colors.background};
@@ -18,7 +18,11 @@ def validate_env_vars(env_vars: Dict[str, str], schema_path: str, strict: bool =
             schema = json.load(f)
         elif schema_file.suffix in ['.yaml', '.yml']:
             import yaml
-            schema = yaml.safe_load(f)
+            try:
+                from yaml import CSafeLoader as SafeLoader
+            except ImportError:
+                from yaml import SafeLoader
+            schema = yaml.load(f, Loader=SafeLoader)
         else:
             raise ValueError("Schema must be JSON or YAML")
 
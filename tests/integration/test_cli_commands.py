@@ -3,6 +3,9 @@ import pytest
 from pathlib import Path
 from envcli.cli import app
 
+# These tests share the real profiles directory through the env_manager fixture
+pytestmark = pytest.mark.xdist_group("envcli_profiles")
+
 
 class TestCLICommands:
     def test_env_list_command(self, cli_runner, env_manager, sample_env_vars):
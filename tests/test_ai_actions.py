@@ -2,16 +2,17 @@
 """Test AI Actions - Safe application of recommendations."""
 
 import sys
-import os
 import json
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import pytest
 
 from envcli.env_manager import EnvManager
 from envcli.ai_actions import AIActionExecutor, AIAction
 
+# Writes named profiles under the real CONFIG_DIR
+pytestmark = pytest.mark.xdist_group("envcli_profiles")
+
 def setup_test_profile():
     """Create a test profile with intentionally messy variables."""
     profile = "test_ai_actions"
@@ -6,19 +6,21 @@ Tests custom naming rules, prefix rules, transformation rules, and exclusions.
 """
 
 import sys
-import os
 import json
 import tempfile
 import shutil
+from collections import Counter
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import pytest
 
 from envcli.ai_actions import AIActionExecutor
 from envcli.env_manager import EnvManager
 from envcli.config import CONFIG_DIR
 
+# Writes named profiles under the real CONFIG_DIR
+pytestmark = pytest.mark.xdist_group("envcli_profiles")
+
 def setup_test_profile():
     """Create a test profile with messy variables."""
     profile = "test_custom_rules"
@@ -237,10 +239,11 @@ def test_apply_custom_rules():
     manager = EnvManager(profile)
     
     # Add comprehensive rules
-    executor.add_exclusion(r'^(PATH|HOME)$', 'System variables')
-    executor.add_naming_rule(r'.*_(key|password|token)', 'uppercase', 'Secrets uppercase')
-    executor.add_prefix_rule(r'^redis_', 'REDIS_', 'Group Redis')
-    executor.add_prefix_rule(r'^postgres_', 'DATABASE_', 'Group database')
+    with executor.batch():
+        executor.add_exclusion(r'^(PATH|HOME)$', 'System variables')
+        executor.add_naming_rule(r'.*_(key|password|token)', 'uppercase', 'Secrets uppercase')
+        executor.add_prefix_rule(r'^redis_', 'REDIS_', 'Group Redis')
+        executor.add_prefix_rule(r'^postgres_', 'DATABASE_', 'Group database')
     
     print("✓ Added 4 custom rules")
     
@@ -283,13 +286,18 @@ def test_list_and_remove_rules():
     executor = AIActionExecutor(profile)
     
     # Add various rules
-    executor.add_naming_rule(r'.*_key$', 'uppercase', 'Keys uppercase')
-    executor.add_prefix_rule(r'^redis_', 'REDIS_', 'Redis prefix')
-    executor.add_transformation_rule(r'.*api.*', 'replace:api:API', 'API transform')
-    executor.add_exclusion(r'^PATH$', 'System PATH')
+    with executor.batch():
+        executor.add_naming_rule(r'.*_key$', 'uppercase', 'Keys uppercase')
+        executor.add_prefix_rule(r'^redis_', 'REDIS_', 'Redis prefix')
+        executor.add_transformation_rule(r'.*api.*', 'replace:api:API', 'API transform')
+        executor.add_exclusion(r'^PATH$', 'System PATH')
     
     print("✓ Added 4 rules")
     
+    # Batched rules are persisted once the block exits
+    persisted = AIActionExecutor(profile).list_custom_rules()
+    assert len(persisted['exclusions']) == 1, "Batched rules should be saved on exit"
+    
     # List rules
     rules = executor.list_custom_rules()
     
@@ -329,9 +337,10 @@ def test_value_preservation():
     manager = EnvManager(profile)
     
     # Add aggressive rules that will modify many variables
-    executor.add_naming_rule(r'.*', 'SCREAMING_SNAKE_CASE', 'All uppercase')
-    executor.add_prefix_rule(r'^redis_', 'REDIS_', 'Redis prefix')
-    executor.add_prefix_rule(r'^postgres_', 'DB_', 'DB prefix')
+    with executor.batch():
+        executor.add_naming_rule(r'.*', 'SCREAMING_SNAKE_CASE', 'All uppercase')
+        executor.add_prefix_rule(r'^redis_', 'REDIS_', 'Redis prefix')
+        executor.add_prefix_rule(r'^postgres_', 'DB_', 'DB prefix')
     
     print("✓ Added aggressive transformation rules")
     
@@ -346,21 +355,15 @@ def test_value_preservation():
     
     print("\n🔒 CRITICAL: Verifying value preservation...")
     
-    all_original_values = set(original_data.values())
-    all_final_values = set(final_env.values())
-    
-    # Every original value must exist in final env
-    for original_value in all_original_values:
-        assert original_value in all_final_values, \
-            f"CRITICAL: Value '{original_value}' was lost during transformation!"
-    
-    print(f"✓ All {len(all_original_values)} unique values preserved")
-    
-    # Verify count matches (accounting for duplicates)
-    assert len(original_data) == len(final_env), \
-        f"Variable count changed: {len(original_data)} → {len(final_env)}"
+    # Every original value must survive exactly as often as it appeared;
+    # comparing multisets also catches dropped or duplicated variables
+    original_values = Counter(original_data.values())
+    final_values = Counter(final_env.values())
+    assert original_values == final_values, \
+        f"CRITICAL: Values changed during transformation! " \
+        f"Lost: {original_values - final_values}, added: {final_values - original_values}"
     
-    print(f"✓ Variable count preserved: {len(final_env)}")
+    print(f"✓ All {len(final_env)} values preserved")
     
     print("\n✅ Value preservation test passed!")
     print("🔒 SECURITY GUARANTEE: No values were exposed or lost!")
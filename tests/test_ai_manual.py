@@ -6,7 +6,6 @@ Run this to verify the AI provider system works correctly.
 
 import sys
 import os
-sys.path.insert(0, 'src')
 
 from envcli.ai_providers import get_provider, PatternMatchingProvider
 from envcli.ai_assistant import AIAssistant
@@ -2,11 +2,13 @@
 Tests for AI provider system.
 """
 
-import pytest
 import os
-from unittest.mock import Mock, patch, MagicMock
+import httpx
+import pytest
+from unittest.mock import Mock, create_autospec, patch
 from envcli.ai_providers import (
     get_provider,
+    AIProvider,
     OpenAIProvider,
     AnthropicProvider,
     GoogleProvider,
@@ -24,6 +26,8 @@ class TestAIProviders:
         provider = get_provider("pattern-matching")
         assert provider.get_provider_name() == "Pattern Matching (Local)"
         assert provider.is_available() is True
+        # Stateless, so every lookup shares one instance
+        assert get_provider("pattern-matching") is provider
         
         # Test analysis
         metadata = {"variable_count": 5}
@@ -31,52 +35,40 @@ class TestAIProviders:
         assert "Pattern-based Analysis" in result
         assert "local" in result.lower()
     
-    def test_openai_provider_without_key(self):
-        """Test OpenAI provider without API key."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = get_provider("openai")
-            assert provider.get_provider_name() == "OpenAI (gpt-4o-mini)"
-            assert provider.is_available() is False
-    
-    def test_openai_provider_with_key(self):
-        """Test OpenAI provider with API key."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test123"}):
-            provider = get_provider("openai")
-            assert provider.is_available() is True
-    
-    def test_anthropic_provider_without_key(self):
-        """Test Anthropic provider without API key."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = get_provider("anthropic")
-            assert "Anthropic" in provider.get_provider_name()
-            assert provider.is_available() is False
-    
-    def test_anthropic_provider_with_key(self):
-        """Test Anthropic provider with API key."""
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test123"}):
-            provider = get_provider("anthropic")
-            assert provider.is_available() is True
-    
-    def test_google_provider_without_key(self):
-        """Test Google provider without API key."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = get_provider("google")
-            assert "Google" in provider.get_provider_name()
-            assert provider.is_available() is False
-    
-    def test_google_provider_with_key(self):
-        """Test Google provider with API key."""
-        with patch.dict(os.environ, {"GOOGLE_API_KEY": "AIza-test123"}):
-            provider = get_provider("google")
-            assert provider.is_available() is True
+    @pytest.mark.parametrize("name,env_var,key,expected_name", [
+        ("openai", "OPENAI_API_KEY", "sk-test123", "OpenAI (gpt-4o-mini)"),
+        ("anthropic", "ANTHROPIC_API_KEY", "sk-ant-test123", "Anthropic"),
+        ("google", "GOOGLE_API_KEY", "AIza-test123", "Google"),
+    ])
+    def test_provider_availability(self, monkeypatch, name, env_var, key, expected_name):
+        """Test API-key providers are only available once their key is set."""
+        monkeypatch.delenv(env_var, raising=False)
+        provider = get_provider(name)
+        assert expected_name in provider.get_provider_name()
+        assert provider.is_available() is False
+        
+        # A key set after an earlier lookup is picked up by the next one
+        monkeypatch.setenv(env_var, key)
+        assert get_provider(name).is_available() is True
     
-    def test_ollama_provider(self):
+    @patch('httpx.Client')
+    def test_ollama_provider(self, mock_client):
         """Test Ollama provider."""
+        tags_response = Mock(status_code=200)
+        tags_response.json.return_value = {"models": [{"name": "llama3.2:latest"}]}
+        mock_client.return_value.__enter__.return_value.get.return_value = tags_response
+        
+        provider = get_provider("ollama")
+        assert isinstance(provider, OllamaProvider)
+        assert provider.get_provider_name() == "Ollama (llama3.2:latest)"
+        assert provider.is_available() is True
+    
+    @pytest.mark.integration
+    @pytest.mark.skipif(not os.environ.get("ENVCLI_TEST_OLLAMA"), reason="requires live Ollama")
+    def test_ollama_provider_live(self):
+        """Test Ollama provider against a running Ollama daemon."""
         provider = get_provider("ollama")
-        assert "Ollama" in provider.get_provider_name()
-        # is_available() depends on whether Ollama is running
-        # Just test that it doesn't crash
-        assert isinstance(provider.is_available(), bool)
+        assert provider.is_available() is True
     
     def test_custom_model(self):
         """Test provider with custom model."""
@@ -86,6 +78,15 @@ class TestAIProviders:
         provider = get_provider("anthropic", model="claude-3-opus-20240229")
         assert "claude-3-opus" in provider.get_provider_name()
     
+    def test_incomplete_provider_rejected(self):
+        """Test a provider missing abstract methods cannot be instantiated."""
+        class IncompleteProvider(AIProvider):
+            def get_provider_name(self) -> str:
+                return "Incomplete"
+        
+        with pytest.raises(TypeError):
+            IncompleteProvider()
+    
     def test_invalid_provider(self):
         """Test invalid provider name."""
         with pytest.raises(ValueError, match="Unknown provider"):
@@ -100,110 +101,152 @@ class TestAIProviders:
         assert isinstance(get_provider("pattern-matching"), PatternMatchingProvider)
 
 
+class FakeConfigStore:
+    """In-memory stand-in for a config file Path, backed by a dict."""
+
+    def __init__(self, name="config.json"):
+        self.name = name
+        self.files = {}
+        self.parent = Mock()
+
+    def exists(self):
+        return self.name in self.files
+
+    def read_text(self, encoding=None):
+        return self.files[self.name]
+
+    def write_text(self, data, encoding=None):
+        self.files[self.name] = data
+        return len(data)
+
+
+@pytest.fixture
+def fake_ai_config(monkeypatch):
+    """Route AIAssistant config persistence to an in-memory store."""
+    store = FakeConfigStore("ai_config.json")
+    monkeypatch.setattr('envcli.ai_assistant.AI_CONFIG_FILE', store)
+    return store
+
+
+@pytest.fixture
+def ai(fake_ai_config):
+    """AIAssistant whose config is persisted to an in-memory store."""
+    return AIAssistant()
+
+
+@pytest.fixture(scope="class")
+def mock_env_manager():
+    """Patch the assistant's EnvManager once per class with a small profile."""
+    with patch('envcli.ai_assistant.EnvManager') as mock:
+        mock.return_value.load_env.return_value = {
+            "DATABASE_URL": "postgres://...",
+            "api_key": "secret123",
+            "DEBUG": "true"
+        }
+        yield mock
+
+
 class TestAIAssistant:
     """Test AI assistant with provider system."""
     
-    def test_ai_assistant_initialization(self):
+    def test_ai_assistant_initialization(self, ai):
         """Test AI assistant initializes correctly."""
-        ai = AIAssistant()
         assert hasattr(ai, 'enabled')
         assert hasattr(ai, 'config')
         assert hasattr(ai, 'provider')
     
-    def test_enable_ai_with_provider(self, tmp_path):
+    def test_enable_ai_with_provider(self, ai):
         """Test enabling AI with specific provider."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            ai = AIAssistant()
-            ai.enable_ai(provider="openai", model="gpt-4o-mini")
-            
-            assert ai.enabled is True
-            assert ai.config['provider'] == "openai"
-            assert ai.config['model'] == "gpt-4o-mini"
+        ai.enable_ai(provider="openai", model="gpt-4o-mini")
+        
+        assert ai.enabled is True
+        assert ai.config['provider'] == "openai"
+        assert ai.config['model'] == "gpt-4o-mini"
+        
+        # A fresh assistant reads the persisted config back
+        assert AIAssistant().config['provider'] == "openai"
     
-    def test_disable_ai(self, tmp_path):
+    def test_disable_ai(self, ai):
         """Test disabling AI."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            ai = AIAssistant()
-            ai.enable_ai()
-            assert ai.enabled is True
-            
-            ai.disable_ai()
-            assert ai.enabled is False
+        ai.enable_ai()
+        assert ai.enabled is True
+        
+        ai.disable_ai()
+        assert ai.enabled is False
     
-    def test_configure_provider(self, tmp_path):
+    def test_configure_provider(self, ai):
         """Test configuring provider."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            ai = AIAssistant()
-            ai.enable_ai()
-            
-            # Configure pattern matching (always available)
-            result = ai.configure_provider("pattern-matching")
-            assert result['success'] is True
-            assert result['provider'] == "pattern-matching"
+        ai.enable_ai()
+        
+        # Configure pattern matching (always available)
+        result = ai.configure_provider("pattern-matching")
+        assert result['success'] is True
+        assert result['provider'] == "pattern-matching"
     
-    def test_get_provider_status(self, tmp_path):
+    def test_get_provider_status(self, ai):
         """Test getting provider status."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            ai = AIAssistant()
-            ai.enable_ai(provider="pattern-matching")
-            
-            status = ai.get_provider_status()
-            assert 'enabled' in status
-            assert 'current_provider' in status
-            assert 'providers' in status
-            assert len(status['providers']) == 5  # All 5 providers
-            
-            # Check pattern matching is marked as current
-            pattern_provider = next(p for p in status['providers'] if p['name'] == 'pattern-matching')
-            assert pattern_provider['current'] is True
-            assert pattern_provider['available'] is True
+        ai.enable_ai(provider="pattern-matching")
+        
+        status = ai.get_provider_status()
+        assert 'enabled' in status
+        assert 'current_provider' in status
+        assert 'providers' in status
+        assert len(status['providers']) == 5  # All 5 providers
+        assert list(status['providers_by_name']) == [p['name'] for p in status['providers']]
+        
+        # Check pattern matching is marked as current
+        pattern_provider = status['providers_by_name']['pattern-matching']
+        assert pattern_provider['current'] is True
+        assert pattern_provider['available'] is True
     
-    def test_provider_switching(self, tmp_path):
+    def test_provider_switching(self, ai):
         """Test switching between providers."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            ai = AIAssistant()
-            ai.enable_ai(provider="pattern-matching")
-            
-            # Switch to another provider
-            result = ai.configure_provider("pattern-matching")
-            assert result['success'] is True
-            
-            # Verify it's the current provider
-            status = ai.get_provider_status()
-            assert status['current_provider'] == "pattern-matching"
+        ai.enable_ai(provider="pattern-matching")
+        
+        # Switch to another provider
+        result = ai.configure_provider("pattern-matching")
+        assert result['success'] is True
+        
+        # Verify it's the current provider
+        status = ai.get_provider_status()
+        assert status['current_provider'] == "pattern-matching"
     
-    @patch('envcli.ai_assistant.EnvManager')
-    def test_generate_recommendations_disabled(self, mock_env_manager, tmp_path):
+    def test_generate_recommendations_disabled(self, mock_env_manager, ai):
         """Test recommendations when AI is disabled."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            ai = AIAssistant()
-            ai.disable_ai()
-            
-            result = ai.generate_recommendations("test-profile")
-            assert "error" in result
-            assert "disabled" in result["error"].lower()
+        ai.disable_ai()
+        
+        result = ai.generate_recommendations("test-profile")
+        assert "error" in result
+        assert "disabled" in result["error"].lower()
     
-    @patch('envcli.ai_assistant.EnvManager')
-    def test_generate_recommendations_enabled(self, mock_env_manager, tmp_path):
+    def test_generate_recommendations_enabled(self, mock_env_manager, ai):
         """Test recommendations when AI is enabled."""
-        with patch('envcli.ai_assistant.AI_CONFIG_FILE', tmp_path / 'ai_config.json'):
-            # Mock environment manager
-            mock_manager = Mock()
-            mock_manager.load_env.return_value = {
-                "DATABASE_URL": "postgres://...",
-                "api_key": "secret123",
-                "DEBUG": "true"
-            }
-            mock_env_manager.return_value = mock_manager
-            
-            ai = AIAssistant()
-            ai.enable_ai(provider="pattern-matching")
-            
-            result = ai.generate_recommendations("test-profile")
-            assert "pattern_analysis" in result
-            assert "profile" in result
-            assert result["profile"] == "test-profile"
-            assert "provider" in result
+        ai.enable_ai(provider="pattern-matching")
+        
+        result = ai.generate_recommendations("test-profile")
+        assert "pattern_analysis" in result
+        assert "profile" in result
+        assert result["profile"] == "test-profile"
+        assert "provider" in result
+
+
+@pytest.fixture(scope="class")
+def mock_httpx_client():
+    """Patch httpx.Client once per class with a pre-wired successful response."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.raise_for_status = Mock()
+
+    # An autospec'd instance only exposes real httpx.Client attributes and
+    # checks call signatures, instead of auto-creating child mocks
+    client_instance = create_autospec(httpx.Client, instance=True)
+    client_instance.post.return_value = mock_response
+    
+    patcher = patch('httpx.Client')
+    mock_client = patcher.start()
+    mock_client.return_value.__enter__.return_value = client_instance
+    yield mock_client, mock_response
+    patcher.stop()
 
 
 class TestProviderIntegration:
@@ -221,26 +264,18 @@ class TestProviderIntegration:
         assert isinstance(result, str)
         assert len(result) > 0
     
-    @patch('httpx.Client')
-    def test_openai_provider_api_call(self, mock_client):
+    def test_openai_provider_api_call(self, mock_httpx_client, monkeypatch):
         """Test OpenAI provider makes correct API call."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test123"}):
-            # Mock successful response
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "choices": [{"message": {"content": "Test analysis"}}]
-            }
-            mock_response.raise_for_status = Mock()
-            
-            mock_context = MagicMock()
-            mock_context.__enter__.return_value.post.return_value = mock_response
-            mock_client.return_value = mock_context
-            
-            provider = OpenAIProvider()
-            result = provider.analyze_metadata({"test": "data"}, "context")
-            
-            assert result == "Test analysis"
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test123")
+        _, mock_response = mock_httpx_client
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "Test analysis"}}]
+        }
+        
+        provider = OpenAIProvider()
+        result = provider.analyze_metadata({"test": "data"}, "context")
+        
+        assert result == "Test analysis"
     
     def test_all_providers_have_required_methods(self):
         """Test all providers implement required methods."""
@@ -252,13 +287,9 @@ class TestProviderIntegration:
             OllamaProvider()
         ]
         
+        # AIProvider is an ABC, so instantiation already enforced the abstract methods
         for provider in providers:
-            assert hasattr(provider, 'get_provider_name')
-            assert hasattr(provider, 'is_available')
-            assert hasattr(provider, 'analyze_metadata')
-            assert callable(provider.get_provider_name)
-            assert callable(provider.is_available)
-            assert callable(provider.analyze_metadata)
+            assert isinstance(provider, AIProvider)
 
 
 if __name__ == "__main__":
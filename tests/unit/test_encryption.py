@@ -1,8 +1,22 @@
+import io
+import os
 import pytest
 from pathlib import Path
 from unittest.mock import patch, mock_open, MagicMock
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet
-from envcli.encryption import get_or_create_key, encrypt_file, decrypt_file, KEY_FILE
+from envcli.encryption import (
+    get_or_create_key, encrypt_file, encrypt_files, decrypt_file, encrypt_stream, decrypt_stream,
+    KEY_FILE, STREAM_HEADER, CHUNK_SIZE, _rewrite
+)
+
+
+def _gcm_decrypt(key, data):
+    """Decrypt the chunked stream layout written by encrypt_file."""
+    assert data.startswith(STREAM_HEADER)
+    out = io.BytesIO()
+    decrypt_stream(io.BytesIO(data), out, key)
+    return out.getvalue()
 
 
 class TestEncryption:
@@ -10,7 +24,6 @@ class TestEncryption:
     @patch('envcli.encryption.KEY_FILE')
     def test_get_or_create_key_existing(self, mock_key_file, mock_config_dir):
         """Test getting existing encryption key."""
-        mock_key_file.exists.return_value = True
         mock_key_file.__str__ = lambda x: "/path/to/key"
         expected_key = b"existing_key_data"
 
@@ -18,25 +31,45 @@ class TestEncryption:
             result = get_or_create_key()
 
             assert result == expected_key
-            mock_file.assert_called_with(mock_key_file, 'rb')
+            mock_file.assert_called_once_with(mock_key_file, 'rb')
+            mock_config_dir.mkdir.assert_not_called()
+
+    @patch('envcli.encryption.CONFIG_DIR')
+    @patch('envcli.encryption.KEY_FILE')
+    def test_get_or_create_key_cached(self, mock_key_file, mock_config_dir):
+        """Test the key file is only read once until the cache is cleared."""
+        with patch('builtins.open', mock_open(read_data=b"existing_key_data")) as mock_file:
+            assert get_or_create_key() == b"existing_key_data"
+            assert get_or_create_key() == b"existing_key_data"
+            assert mock_file.call_count == 1
+
+            get_or_create_key.cache_clear()
+            get_or_create_key()
+            assert mock_file.call_count == 2
 
     @patch('envcli.encryption.CONFIG_DIR')
     @patch('envcli.encryption.KEY_FILE')
     @patch('cryptography.fernet.Fernet.generate_key')
     def test_get_or_create_key_new(self, mock_generate_key, mock_key_file, mock_config_dir):
         """Test creating new encryption key when none exists."""
-        mock_key_file.exists.return_value = False
         mock_key_file.__str__ = lambda x: "/path/to/key"
         new_key = b"new_generated_key"
         mock_generate_key.return_value = new_key
 
-        with patch('builtins.open', mock_open()) as mock_file:
+        mock_file = mock_open()
+        def fake_open(path, mode):
+            if mode == 'rb':
+                raise FileNotFoundError(path)
+            return mock_file(path, mode)
+
+        with patch('builtins.open', side_effect=fake_open):
             result = get_or_create_key()
 
             assert result == new_key
+            mock_config_dir.mkdir.assert_called_once_with(parents=True, exist_ok=True)
             # Verify key was written to file
-            handle = mock_file()
-            handle.write.assert_called_with(new_key)
+            mock_file.assert_called_once_with(mock_key_file, 'wb')
+            mock_file().write.assert_called_with(new_key)
 
     @patch('envcli.encryption.get_or_create_key')
     def test_encrypt_file_success(self, mock_get_key, temp_config_dir):
@@ -57,9 +90,56 @@ class TestEncryption:
         encrypted_content = test_file.read_bytes()
         assert encrypted_content != original_content
         # Verify it can be decrypted back
-        fernet = Fernet(valid_key)
-        decrypted = fernet.decrypt(encrypted_content)
-        assert decrypted == original_content
+        assert _gcm_decrypt(valid_key, encrypted_content) == original_content
+
+    @patch('envcli.encryption.get_or_create_key')
+    def test_encrypt_file_leaves_sibling_files_alone(self, mock_get_key, temp_config_dir):
+        """Test encrypting a file never touches an existing "<name>.enc" or "<name>.dec"."""
+        valid_key = Fernet.generate_key()
+        mock_get_key.return_value = valid_key
+
+        test_file = temp_config_dir / "test.txt"
+        test_file.write_bytes(b"Hello, World!")
+        for suffix in (".enc", ".dec"):
+            (temp_config_dir / f"test.txt{suffix}").write_bytes(b"unrelated")
+
+        encrypt_file(str(test_file))
+        decrypt_file(str(test_file))
+
+        assert test_file.read_bytes() == b"Hello, World!"
+        for suffix in (".enc", ".dec"):
+            assert (temp_config_dir / f"test.txt{suffix}").read_bytes() == b"unrelated"
+        assert sorted(p.name for p in temp_config_dir.iterdir()) == [
+            "test.txt", "test.txt.dec", "test.txt.enc"
+        ]
+
+    @patch('envcli.encryption.get_or_create_key')
+    def test_encrypt_file_through_symlink(self, mock_get_key, temp_config_dir):
+        """Test encrypting a symlinked profile rewrites the target and keeps the link."""
+        valid_key = Fernet.generate_key()
+        mock_get_key.return_value = valid_key
+
+        dotfiles = temp_config_dir / "dotfiles"
+        dotfiles.mkdir()
+        target = dotfiles / "prod.json"
+        target.write_bytes(b'{"SECRET":"hunter2"}')
+        link = temp_config_dir / "prod.json"
+        try:
+            link.symlink_to(target)
+        except OSError:
+            pytest.skip("symlinks are not supported here")
+
+        encrypt_file(str(link))
+
+        assert link.is_symlink()
+        assert b"hunter2" not in target.read_bytes()
+        assert _gcm_decrypt(valid_key, target.read_bytes()) == b'{"SECRET":"hunter2"}'
+        assert sorted(p.name for p in dotfiles.iterdir()) == ["prod.json"]
+
+        decrypt_file(str(link))
+
+        assert link.is_symlink()
+        assert target.read_bytes() == b'{"SECRET":"hunter2"}'
 
     def test_encrypt_file_not_found(self, temp_config_dir):
         """Test encrypting a non-existent file raises error."""
@@ -69,8 +149,8 @@ class TestEncryption:
             encrypt_file(str(nonexistent_file))
 
     @patch('envcli.encryption.get_or_create_key')
-    def test_decrypt_file_success(self, mock_get_key, temp_config_dir):
-        """Test decrypting a file successfully."""
+    def test_decrypt_file_legacy_fernet(self, mock_get_key, temp_config_dir):
+        """Test decrypting a file encrypted with Fernet by earlier versions."""
         # Use a valid Fernet key
         from cryptography.fernet import Fernet
         valid_key = Fernet.generate_key()
@@ -88,6 +168,21 @@ class TestEncryption:
         # Verify file contains decrypted content
         assert test_file.read_bytes() == original_content
 
+    @patch('envcli.encryption.get_or_create_key')
+    def test_decrypt_file_tampered(self, mock_get_key, temp_config_dir):
+        """Test a modified AES-GCM file fails authentication instead of decrypting."""
+        mock_get_key.return_value = Fernet.generate_key()
+
+        test_file = temp_config_dir / "test.txt"
+        test_file.write_bytes(b"Hello, World!")
+        encrypt_file(str(test_file))
+        encrypted = bytearray(test_file.read_bytes())
+        encrypted[-1] ^= 1
+        test_file.write_bytes(bytes(encrypted))
+
+        with pytest.raises(ValueError, match="Failed to decrypt file"):
+            decrypt_file(str(test_file))
+
     def test_decrypt_file_not_found(self, temp_config_dir):
         """Test decrypting a non-existent file raises error."""
         nonexistent_file = temp_config_dir / "nonexistent.txt"
@@ -173,6 +268,103 @@ class TestEncryption:
             decrypted_content = file_path.read_bytes()
             assert decrypted_content == original_content
 
+    @pytest.mark.parametrize("size", [CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 3 * CHUNK_SIZE])
+    @patch('envcli.encryption.get_or_create_key')
+    def test_encrypt_decrypt_round_trip_large_file(self, mock_get_key, temp_config_dir, size):
+        """Test files around chunk boundaries round-trip and reject a wrong key."""
+        mock_get_key.return_value = Fernet.generate_key()
+
+        test_file = temp_config_dir / "large.bin"
+        original_content = os.urandom(size)
+        test_file.write_bytes(original_content)
+
+        encrypt_file(str(test_file))
+        encrypted_content = test_file.read_bytes()
+        assert _gcm_decrypt(mock_get_key.return_value, encrypted_content) == original_content
+
+        mock_get_key.return_value = Fernet.generate_key()
+        with pytest.raises(ValueError, match="Failed to decrypt file"):
+            decrypt_file(str(test_file))
+        # The file and its directory are left as they were
+        assert test_file.read_bytes() == encrypted_content
+        assert [p.name for p in temp_config_dir.iterdir()] == ["large.bin"]
+
+    @pytest.mark.parametrize("size", [0, 1, 63, 64, 65, 1000])
+    def test_stream_round_trip_in_memory(self, size):
+        """Test the cipher path alone, on in-memory streams around chunk boundaries."""
+        key = Fernet.generate_key()
+        plaintext = os.urandom(size)
+
+        encrypted = io.BytesIO()
+        encrypt_stream(io.BytesIO(plaintext), encrypted, key, chunk_size=64)
+        decrypted = io.BytesIO()
+        decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, key)
+
+        assert decrypted.getvalue() == plaintext
+
+    @pytest.mark.parametrize("cut", [16, 64 + 16])
+    def test_stream_truncation_detected(self, cut):
+        """Test dropping trailing chunks fails authentication, even at a chunk boundary."""
+        key = Fernet.generate_key()
+        encrypted = io.BytesIO()
+        encrypt_stream(io.BytesIO(os.urandom(256)), encrypted, key, chunk_size=64)
+
+        with pytest.raises(InvalidTag):
+            decrypt_stream(io.BytesIO(encrypted.getvalue()[:-cut]), io.BytesIO(), key)
+
+    @patch('envcli.encryption.get_or_create_key')
+    def test_encrypt_files_batch(self, mock_get_key, temp_config_dir):
+        """Test the batch API encrypts every file and loads the key once."""
+        mock_get_key.return_value = Fernet.generate_key()
+
+        files_and_content = [
+            (temp_config_dir / f"file{i}.txt", f"Content of file {i}".encode())
+            for i in range(5)
+        ]
+        for file_path, content in files_and_content:
+            file_path.write_bytes(content)
+
+        # A path listed twice is only encrypted once
+        paths = [str(file_path) for file_path, _ in files_and_content]
+        assert encrypt_files(paths + paths[:1]) == {}
+
+        mock_get_key.assert_called_once()
+        for file_path, original_content in files_and_content:
+            assert _gcm_decrypt(mock_get_key.return_value, file_path.read_bytes()) == original_content
+
+    @patch('envcli.encryption.get_or_create_key')
+    def test_encrypt_files_reports_failures(self, mock_get_key, temp_config_dir):
+        """Test the batch API returns per-file errors and still encrypts the rest."""
+        mock_get_key.return_value = Fernet.generate_key()
+        good = temp_config_dir / "good.txt"
+        good.write_bytes(b"plain")
+        bad = temp_config_dir / "bad.txt"
+        bad.write_bytes(b"plain")
+
+        def failing_rewrite(path, suffix, transform):
+            if path.name == "bad.txt":
+                raise OSError("disk full")
+            _rewrite(path, suffix, transform)
+
+        with patch('envcli.encryption._rewrite', side_effect=failing_rewrite):
+            errors = encrypt_files([str(good), str(bad)])
+
+        assert list(errors) == [str(bad)]
+        assert isinstance(errors[str(bad)], OSError)
+        assert bad.read_bytes() == b"plain"
+        assert _gcm_decrypt(mock_get_key.return_value, good.read_bytes()) == b"plain"
+
+    @patch('envcli.encryption.get_or_create_key')
+    def test_encrypt_files_missing_file(self, mock_get_key, temp_config_dir):
+        """Test the batch API checks every path before encrypting anything."""
+        existing = temp_config_dir / "exists.txt"
+        existing.write_bytes(b"plain")
+
+        with pytest.raises(FileNotFoundError, match="File .* not found"):
+            encrypt_files([str(existing), str(temp_config_dir / "missing.txt")])
+        assert existing.read_bytes() == b"plain"
+        mock_get_key.assert_not_called()
+
     def test_key_file_path(self):
         """Test that key file path is constructed correctly."""
         from envcli.encryption import KEY_FILE
@@ -196,13 +388,11 @@ class TestEncryption:
         encrypted_content = test_file.read_bytes()
         assert encrypted_content != b""
         # Verify it can be decrypted
-        fernet = Fernet(valid_key)
-        decrypted = fernet.decrypt(encrypted_content)
-        assert decrypted == b""
+        assert _gcm_decrypt(valid_key, encrypted_content) == b""
 
     @patch('envcli.encryption.get_or_create_key')
     def test_decrypt_file_empty_encrypted(self, mock_get_key, temp_config_dir):
-        """Test decrypting an empty encrypted file."""
+        """Test decrypting an empty Fernet-encrypted file."""
         from cryptography.fernet import Fernet
         valid_key = Fernet.generate_key()
         mock_get_key.return_value = valid_key
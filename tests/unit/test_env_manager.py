@@ -1,198 +1,134 @@
 import json
 import tempfile
 import pytest
-from pathlib import Path
+from pathlib import Path, PurePath
 from unittest.mock import patch, mock_open
-from envcli.env_manager import EnvManager
 
+# Skip at collection, before envcli.env_manager imports it, if PyYAML is missing
+yaml = pytest.importorskip("yaml")
 
-class TestEnvManager:
-    def test_init_with_profile(self, temp_config_dir):
-        """Test initialization with specific profile."""
-        with patch('envcli.env_manager.PROFILES_DIR', temp_config_dir / "profiles"):
-            manager = EnvManager("test_profile")
-            assert manager.profile == "test_profile"
-            assert str(manager.profile_file).endswith("test_profile.json")
-
-    def test_init_without_profile(self, temp_config_dir):
-        """Test initialization without profile uses default."""
-        with patch('envcli.env_manager.PROFILES_DIR', temp_config_dir / "profiles"):
-            with patch('envcli.env_manager.get_current_profile', return_value="default"):
-                manager = EnvManager()
-                assert manager.profile == "default"
-
-    def test_load_env_empty_profile(self, temp_config_dir):
-        """Test loading empty profile returns empty dict."""
-        with patch('envcli.env_manager.PROFILES_DIR', temp_config_dir / "profiles"):
-            manager = EnvManager("empty_profile")
-            result = manager.load_env()
-            assert result == {}
-
-    def test_load_env_existing_profile(self, temp_config_dir, sample_env_vars):
-        """Test loading existing profile."""
-        profiles_dir = temp_config_dir / "profiles"
-        profiles_dir.mkdir(exist_ok=True)
-
-        profile_file = profiles_dir / "test_profile.json"
-        with open(profile_file, 'w') as f:
-            json.dump(sample_env_vars, f)
+from envcli.env_manager import EnvManager, SafeDumper, SafeLoader
 
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager = EnvManager("test_profile")
-            result = manager.load_env()
-            assert result == sample_env_vars
+# orjson is optional; it only speeds up writing test fixture data
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-    def test_save_env_creates_directory(self, temp_config_dir, sample_env_vars):
-        """Test saving env vars creates profiles directory if needed."""
-        profiles_dir = temp_config_dir / "profiles"
 
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager = EnvManager("test_profile")
-            manager.save_env(sample_env_vars)
+def _json_bytes(obj):
+    """Compact UTF-8 JSON for obj, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-            assert profiles_dir.exists()
-            assert (profiles_dir / "test_profile.json").exists()
 
-            # Verify content
-            with open(profiles_dir / "test_profile.json", 'r') as f:
-                saved_data = json.load(f)
-            assert saved_data == sample_env_vars
+def _write_env(path, env_vars):
+    path.write_text("".join(f"{k}={v}\n" for k, v in env_vars.items()))
 
-    def test_list_env_unmasked(self, env_manager, sample_env_vars):
-        """Test listing env vars without masking."""
-        result = env_manager.list_env(mask=False)
-        assert result == sample_env_vars
 
-    def test_list_env_masked(self, env_manager, sample_env_vars):
-        """Test listing env vars with masking for sensitive keys."""
-        result = env_manager.list_env(mask=True)
+def _write_yaml(path, env_vars):
+    path.write_text(yaml.dump(env_vars, Dumper=SafeDumper))
 
-        # Sensitive keys should be masked
-        assert result["SECRET_TOKEN"] == "*" * len(sample_env_vars["SECRET_TOKEN"])
-        assert result["API_KEY"] == "*" * len(sample_env_vars["API_KEY"])
 
-        # Non-sensitive keys should not be masked
-        assert result["DEBUG"] == sample_env_vars["DEBUG"]
-        assert result["PORT"] == sample_env_vars["PORT"]
+class MemoryProfiles:
+    """In-memory stand-in for PROFILES_DIR: profile file names mapped to bytes."""
 
-    def test_add_env_new_key(self, env_manager, sample_env_vars):
-        """Test adding a new environment variable."""
-        env_manager.add_env("NEW_KEY", "new_value")
+    def __init__(self):
+        self.files = {}
 
-        # Reload and check
-        result = env_manager.load_env()
-        assert result["NEW_KEY"] == "new_value"
-        # Existing vars should still be there
-        assert result["API_KEY"] == sample_env_vars["API_KEY"]
+    def set(self, name, data):
+        self.files[name] = data.encode("utf-8") if isinstance(data, str) else data
 
-    def test_add_env_update_existing(self, env_manager, sample_env_vars):
-        """Test updating an existing environment variable."""
-        new_value = "updated_value"
-        env_manager.add_env("API_KEY", new_value)
+    def set_json(self, name, obj):
+        self.files[name] = _json_bytes(obj)
 
-        result = env_manager.load_env()
-        assert result["API_KEY"] == new_value
+    def get(self, name):
+        return self.files[name]
 
-    def test_remove_env_existing_key(self, env_manager, sample_env_vars):
-        """Test removing an existing environment variable."""
-        env_manager.remove_env("API_KEY")
 
-        result = env_manager.load_env()
-        assert "API_KEY" not in result
-        # Other keys should remain
-        assert result["DEBUG"] == sample_env_vars["DEBUG"]
+@pytest.fixture
+def mem_profiles(monkeypatch):
+    """Route EnvManager profile reads and writes to an in-memory store."""
+    store = MemoryProfiles()
+    monkeypatch.setattr('envcli.env_manager.PROFILES_DIR', PurePath("profiles"))
+    monkeypatch.setattr(EnvManager, '_read_file',
+                        lambda self: store.files.get(self.profile_file.name))
+    monkeypatch.setattr(EnvManager, '_write_file',
+                        lambda self, data: store.set(self.profile_file.name, data))
+    return store
 
-    def test_remove_env_nonexistent_key(self, env_manager, sample_env_vars):
-        """Test removing a non-existent key does nothing."""
-        env_manager.remove_env("NONEXISTENT_KEY")
 
-        result = env_manager.load_env()
-        assert result == sample_env_vars  # Should be unchanged
+@pytest.fixture
+def fake_dotenv(monkeypatch):
+    """Serve EnvManager's dotenv_values from a dict keyed by file path string."""
+    store = {}
+    monkeypatch.setattr('envcli.env_manager.dotenv_values', lambda path: store[str(path)])
+    return store
 
-    def test_load_from_file_env_format(self, env_manager, temp_config_dir):
-        """Test loading from .env format file."""
-        env_content = """API_KEY=test_key
-DATABASE_URL=postgresql://localhost/db
-DEBUG=true
-"""
 
-        env_file = temp_config_dir / ".env"
-        with open(env_file, 'w') as f:
-            f.write(env_content)
+@pytest.fixture(scope="module")
+def sample_env_json(sample_env_data):
+    """The sample environment variables as JSON bytes, serialized once."""
+    return _json_bytes(dict(sample_env_data))
 
-        env_manager.load_from_file(str(env_file), format="env")
 
-        result = env_manager.load_env()
-        assert result["API_KEY"] == "test_key"
-        assert result["DATABASE_URL"] == "postgresql://localhost/db"
-        assert result["DEBUG"] == "true"
+@pytest.fixture
+def profiles_dir(temp_config_dir):
+    """An existing, empty profiles directory inside temp_config_dir."""
+    path = temp_config_dir / "profiles"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
 
-    def test_load_from_file_json_format(self, env_manager, temp_config_dir, sample_env_vars):
-        """Test loading from JSON format file."""
-        json_file = temp_config_dir / "config.json"
-        with open(json_file, 'w') as f:
-            json.dump(sample_env_vars, f)
 
-        env_manager.load_from_file(str(json_file), format="json")
+@pytest.fixture(scope="class")
+def readonly_env_manager(tmp_path_factory, sample_env_data):
+    """An EnvManager holding the sample vars, written once per test class.
 
-        result = env_manager.load_env()
-        assert result == sample_env_vars
+    Shared by every test in the class, so tests must not modify its profile.
+    """
+    profiles_dir = tmp_path_factory.mktemp("profiles")
+    # profile_file is resolved in __init__, so the manager keeps using this
+    # directory after the patch is undone
+    with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
+        manager = EnvManager("readonly_profile")
+        manager.save_env(dict(sample_env_data))
+    return manager
 
-    def test_load_from_file_yaml_format(self, env_manager, temp_config_dir, sample_env_vars):
-        """Test loading from YAML format file."""
-        import yaml
 
-        yaml_file = temp_config_dir / "config.yaml"
-        with open(yaml_file, 'w') as f:
-            yaml.dump(sample_env_vars, f)
+@pytest.fixture
+def mem_env_manager(mem_profiles, sample_env_json):
+    """An EnvManager whose profiles live in memory rather than on disk."""
+    mem_profiles.set("test_profile.json", sample_env_json)
+    return EnvManager("test_profile")
 
-        env_manager.load_from_file(str(yaml_file), format="yaml")
 
-        result = env_manager.load_env()
+class TestEnvManagerReadonly:
+    def test_list_env_unmasked(self, readonly_env_manager, sample_env_vars):
+        """Test listing env vars without masking."""
+        result = readonly_env_manager.list_env(mask=False)
         assert result == sample_env_vars
 
-    def test_load_from_file_unsupported_format(self, env_manager, temp_config_dir):
-        """Test loading from unsupported format raises error."""
-        txt_file = temp_config_dir / "config.txt"
-        with open(txt_file, 'w') as f:
-            f.write("KEY=value")
+    def test_list_env_masked(self, readonly_env_manager, sample_env_vars):
+        """Test listing env vars with masking for sensitive keys."""
+        result = readonly_env_manager.list_env(mask=True)
 
-        with pytest.raises(ValueError, match="Unsupported format"):
-            env_manager.load_from_file(str(txt_file), format="txt")
+        # Sensitive keys should be masked
+        assert result["SECRET_TOKEN"] == "*" * len(sample_env_vars["SECRET_TOKEN"])
+        assert result["API_KEY"] == "*" * len(sample_env_vars["API_KEY"])
 
-    def test_load_from_file_nonexistent_file(self, env_manager):
-        """Test loading from non-existent file raises error."""
-        with pytest.raises(FileNotFoundError):
-            env_manager.load_from_file("nonexistent.env")
+        # Non-sensitive keys should not be masked
+        assert result["DEBUG"] == sample_env_vars["DEBUG"]
+        assert result["PORT"] == sample_env_vars["PORT"]
 
-    def test_load_from_file_filters_none_values(self, env_manager, temp_config_dir):
-        """Test that None values are filtered out when loading."""
-        # Create a .env file with some None values (dotenv can return None for malformed lines)
-        with patch('envcli.env_manager.dotenv_values') as mock_dotenv:
-            mock_dotenv.return_value = {
-                "VALID_KEY": "valid_value",
-                "NONE_KEY": None,
-                "EMPTY_KEY": ""
-            }
-
-            env_file = temp_config_dir / ".env"
-            env_file.touch()  # Create the file so it exists
-            env_manager.load_from_file(str(env_file), format="env")
-
-            result = env_manager.load_env()
-            assert "VALID_KEY" in result
-            assert "NONE_KEY" not in result
-            assert "EMPTY_KEY" in result  # Empty string is not None
-
-    def test_export_to_file_env_format(self, env_manager, temp_config_dir, sample_env_vars):
+    def test_export_to_file_env_format(self, readonly_env_manager, temp_config_dir, sample_env_vars):
         """Test exporting to .env format."""
         export_file = temp_config_dir / "export.env"
 
-        env_manager.export_to_file(str(export_file), format="env")
+        readonly_env_manager.export_to_file(str(export_file), format="env")
 
         # Verify file content
-        with open(export_file, 'r') as f:
-            content = f.read()
+        content = export_file.read_text()
 
         lines = content.strip().split('\n')
         assert len(lines) == len(sample_env_vars)
@@ -202,38 +138,33 @@ DEBUG=true
             assert key in sample_env_vars
             assert value == sample_env_vars[key]
 
-    def test_export_to_file_json_format(self, env_manager, temp_config_dir, sample_env_vars):
+    def test_export_to_file_json_format(self, readonly_env_manager, temp_config_dir, sample_env_vars):
         """Test exporting to JSON format."""
         export_file = temp_config_dir / "export.json"
 
-        env_manager.export_to_file(str(export_file), format="json")
+        readonly_env_manager.export_to_file(str(export_file), format="json")
 
-        with open(export_file, 'r') as f:
-            result = json.load(f)
+        result = json.loads(export_file.read_text())
 
         assert result == sample_env_vars
 
-    def test_export_to_file_yaml_format(self, env_manager, temp_config_dir, sample_env_vars):
+    def test_export_to_file_yaml_format(self, readonly_env_manager, temp_config_dir, sample_env_vars):
         """Test exporting to YAML format."""
-        import yaml
-
         export_file = temp_config_dir / "export.yaml"
 
-        env_manager.export_to_file(str(export_file), format="yaml")
+        readonly_env_manager.export_to_file(str(export_file), format="yaml")
 
-        with open(export_file, 'r') as f:
-            result = yaml.safe_load(f)
+        result = yaml.load(export_file.read_text(), Loader=SafeLoader)
 
         assert result == sample_env_vars
 
-    def test_export_to_file_shell_format(self, env_manager, temp_config_dir, sample_env_vars):
+    def test_export_to_file_shell_format(self, readonly_env_manager, temp_config_dir, sample_env_vars):
         """Test exporting to shell format."""
         export_file = temp_config_dir / "export.sh"
 
-        env_manager.export_to_file(str(export_file), format="shell")
+        readonly_env_manager.export_to_file(str(export_file), format="shell")
 
-        with open(export_file, 'r') as f:
-            content = f.read()
+        content = export_file.read_text()
 
         lines = content.strip().split('\n')
         assert len(lines) == len(sample_env_vars)
@@ -241,139 +172,205 @@ DEBUG=true
         for line in lines:
             assert line.startswith("export ")
             # Extract key=value part
-            export_part = line[7:]  # Remove "export "
+            export_part = line.removeprefix("export ")
             key, value = export_part.split('=', 1)
             assert key in sample_env_vars
             # Value should be quoted
             assert value.startswith('"') and value.endswith('"')
-            assert value.strip('"') == sample_env_vars[key]
+            assert value[1:-1] == sample_env_vars[key]
 
-    def test_export_to_file_unsupported_format(self, env_manager, temp_config_dir):
+    def test_export_to_file_unsupported_format(self, readonly_env_manager, temp_config_dir):
         """Test exporting to unsupported format raises error."""
         export_file = temp_config_dir / "export.txt"
 
         with pytest.raises(ValueError, match="Unsupported format"):
-            env_manager.export_to_file(str(export_file), format="txt")
+            readonly_env_manager.export_to_file(str(export_file), format="txt")
 
-    def test_diff_identical_profiles(self, temp_config_dir, sample_env_vars):
-        """Test diff between identical profiles."""
-        profiles_dir = temp_config_dir / "profiles"
-        profiles_dir.mkdir(exist_ok=True)
 
-        # Create two identical profiles
-        for profile_name in ["profile1", "profile2"]:
-            profile_file = profiles_dir / f"{profile_name}.json"
-            with open(profile_file, 'w') as f:
-                json.dump(sample_env_vars, f)
+class TestEnvManagerOnDisk:
+    @pytest.fixture(autouse=True)
+    def _patch_profiles_dir(self, monkeypatch, temp_config_dir):
+        monkeypatch.setattr('envcli.env_manager.PROFILES_DIR', temp_config_dir / "profiles")
 
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager1 = EnvManager("profile1")
-            result = manager1.diff("profile2")
+    def test_load_env_existing_profile(self, profiles_dir, sample_env_vars, sample_env_json):
+        """Test loading existing profile."""
+        (profiles_dir / "test_profile.json").write_bytes(sample_env_json)
 
-            assert result["added"] == {}
-            assert result["removed"] == {}
-            assert result["changed"] == {}
+        manager = EnvManager("test_profile")
+        result = manager.load_env()
+        assert result == sample_env_vars
 
-    def test_diff_added_keys(self, temp_config_dir, sample_env_vars):
-        """Test diff when other profile has additional keys."""
+    def test_save_env_creates_directory(self, temp_config_dir, sample_env_vars):
+        """Test saving env vars creates profiles directory if needed."""
         profiles_dir = temp_config_dir / "profiles"
-        profiles_dir.mkdir(exist_ok=True)
 
-        # Profile 1: base vars
-        profile1_file = profiles_dir / "profile1.json"
-        with open(profile1_file, 'w') as f:
-            json.dump(sample_env_vars, f)
+        manager = EnvManager("test_profile")
+        manager.save_env(sample_env_vars)
 
-        # Profile 2: base vars plus additional
-        profile2_vars = {**sample_env_vars, "NEW_KEY": "new_value", "ANOTHER_KEY": "another_value"}
-        profile2_file = profiles_dir / "profile2.json"
-        with open(profile2_file, 'w') as f:
-            json.dump(profile2_vars, f)
+        assert profiles_dir.exists()
+        assert (profiles_dir / "test_profile.json").exists()
 
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager1 = EnvManager("profile1")
-            result = manager1.diff("profile2")
+        # Verify content
+        saved_data = json.loads((profiles_dir / "test_profile.json").read_text())
+        assert saved_data == sample_env_vars
 
-            assert result["added"] == {"NEW_KEY": "new_value", "ANOTHER_KEY": "another_value"}
-            assert result["removed"] == {}
-            assert result["changed"] == {}
 
-    def test_diff_removed_keys(self, temp_config_dir, sample_env_vars):
-        """Test diff when other profile has removed keys."""
-        profiles_dir = temp_config_dir / "profiles"
-        profiles_dir.mkdir(exist_ok=True)
+class TestEnvManagerMutating:
+    def test_init_with_profile(self, mem_profiles):
+        """Test initialization with specific profile."""
+        manager = EnvManager("test_profile")
+        assert manager.profile == "test_profile"
+        assert str(manager.profile_file).endswith("test_profile.json")
+
+    def test_init_without_profile(self, mem_profiles):
+        """Test initialization without profile uses default."""
+        with patch('envcli.env_manager.get_current_profile', return_value="default"):
+            manager = EnvManager()
+            assert manager.profile == "default"
 
-        # Profile 1: full vars
-        profile1_file = profiles_dir / "profile1.json"
-        with open(profile1_file, 'w') as f:
-            json.dump(sample_env_vars, f)
+    def test_load_env_empty_profile(self, mem_profiles):
+        """Test loading empty profile returns empty dict."""
+        manager = EnvManager("empty_profile")
+        result = manager.load_env()
+        assert result == {}
 
-        # Profile 2: missing some keys
-        profile2_vars = {k: v for k, v in sample_env_vars.items() if k != "API_KEY"}
-        profile2_file = profiles_dir / "profile2.json"
-        with open(profile2_file, 'w') as f:
-            json.dump(profile2_vars, f)
+    def test_add_env_new_key(self, mem_env_manager, sample_env_vars):
+        """Test adding a new environment variable."""
+        mem_env_manager.add_env("NEW_KEY", "new_value")
 
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager1 = EnvManager("profile1")
-            result = manager1.diff("profile2")
+        # Reload and check
+        result = mem_env_manager.load_env()
+        assert result["NEW_KEY"] == "new_value"
+        # Existing vars should still be there
+        assert result["API_KEY"] == sample_env_vars["API_KEY"]
 
-            assert result["added"] == {}
-            assert result["removed"] == {"API_KEY": sample_env_vars["API_KEY"]}
-            assert result["changed"] == {}
+    def test_add_env_update_existing(self, mem_env_manager, sample_env_vars):
+        """Test updating an existing environment variable."""
+        new_value = "updated_value"
+        mem_env_manager.add_env("API_KEY", new_value)
 
-    def test_diff_changed_values(self, temp_config_dir, sample_env_vars):
-        """Test diff when values have changed."""
-        profiles_dir = temp_config_dir / "profiles"
-        profiles_dir.mkdir(exist_ok=True)
-
-        # Profile 1: original values
-        profile1_file = profiles_dir / "profile1.json"
-        with open(profile1_file, 'w') as f:
-            json.dump(sample_env_vars, f)
-
-        # Profile 2: some changed values
-        profile2_vars = sample_env_vars.copy()
-        profile2_vars["API_KEY"] = "changed_key"
-        profile2_vars["DEBUG"] = "false"
-        profile2_file = profiles_dir / "profile2.json"
-        with open(profile2_file, 'w') as f:
-            json.dump(profile2_vars, f)
-
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager1 = EnvManager("profile1")
-            result = manager1.diff("profile2")
-
-            assert result["added"] == {}
-            assert result["removed"] == {}
-            assert result["changed"] == {
-                "API_KEY": {"old": sample_env_vars["API_KEY"], "new": "changed_key"},
-                "DEBUG": {"old": sample_env_vars["DEBUG"], "new": "false"}
-            }
-
-    def test_diff_mixed_changes(self, temp_config_dir, sample_env_vars):
-        """Test diff with mixed changes: added, removed, and changed."""
-        profiles_dir = temp_config_dir / "profiles"
-        profiles_dir.mkdir(exist_ok=True)
-
-        # Profile 1
-        profile1_file = profiles_dir / "profile1.json"
-        with open(profile1_file, 'w') as f:
-            json.dump(sample_env_vars, f)
-
-        # Profile 2: mixed changes
-        profile2_vars = sample_env_vars.copy()
-        profile2_vars["API_KEY"] = "changed_key"  # changed
-        profile2_vars["NEW_KEY"] = "new_value"    # added
-        del profile2_vars["DEBUG"]                 # removed
-        profile2_file = profiles_dir / "profile2.json"
-        with open(profile2_file, 'w') as f:
-            json.dump(profile2_vars, f)
-
-        with patch('envcli.env_manager.PROFILES_DIR', profiles_dir):
-            manager1 = EnvManager("profile1")
-            result = manager1.diff("profile2")
-
-            assert result["added"] == {"NEW_KEY": "new_value"}
-            assert result["removed"] == {"DEBUG": sample_env_vars["DEBUG"]}
-            assert result["changed"] == {"API_KEY": {"old": sample_env_vars["API_KEY"], "new": "changed_key"}}
+        result = mem_env_manager.load_env()
+        assert result["API_KEY"] == new_value
+
+    def test_remove_env_existing_key(self, mem_env_manager, sample_env_vars):
+        """Test removing an existing environment variable."""
+        mem_env_manager.remove_env("API_KEY")
+
+        result = mem_env_manager.load_env()
+        assert "API_KEY" not in result
+        # Other keys should remain
+        assert result["DEBUG"] == sample_env_vars["DEBUG"]
+
+    def test_remove_env_nonexistent_key(self, mem_env_manager, sample_env_vars):
+        """Test removing a non-existent key does nothing."""
+        mem_env_manager.remove_env("NONEXISTENT_KEY")
+
+        result = mem_env_manager.load_env()
+        assert result == sample_env_vars  # Should be unchanged
+
+    @pytest.mark.parametrize("fmt,writer,ext", [
+        ("env", _write_env, ".env"),
+        ("json", lambda path, data: path.write_text(json.dumps(data)), ".json"),
+        ("yaml", _write_yaml, ".yaml"),
+    ])
+    def test_load_from_file_format(self, mem_env_manager, tmp_path, fmt, writer, ext):
+        """Test loading from each supported file format."""
+        file_vars = {
+            "API_KEY": "test_key",
+            "DATABASE_URL": "postgresql://localhost/db",
+            "DEBUG": "true"
+        }
+        source_file = tmp_path / f"config{ext}"
+        writer(source_file, file_vars)
+
+        mem_env_manager.load_from_file(str(source_file), format=fmt)
+
+        result = mem_env_manager.load_env()
+        assert result == file_vars
+
+    def test_load_from_file_unsupported_format(self, mem_env_manager, temp_config_dir):
+        """Test loading from unsupported format raises error."""
+        txt_file = temp_config_dir / "config.txt"
+        txt_file.write_text("KEY=value")
+
+        with pytest.raises(ValueError, match="Unsupported format"):
+            mem_env_manager.load_from_file(str(txt_file), format="txt")
+
+    def test_load_from_file_nonexistent_file(self, mem_env_manager):
+        """Test loading from non-existent file raises error."""
+        with pytest.raises(FileNotFoundError):
+            mem_env_manager.load_from_file("nonexistent.env")
+
+    def test_load_from_file_filters_none_values(self, mem_env_manager, temp_config_dir, fake_dotenv):
+        """Test that None values are filtered out when loading."""
+        # dotenv can return None for malformed lines
+        env_file = temp_config_dir / ".env"
+        env_file.touch()  # Create the file so it exists
+        fake_dotenv[str(env_file)] = {
+            "VALID_KEY": "valid_value",
+            "NONE_KEY": None,
+            "EMPTY_KEY": ""
+        }
+
+        mem_env_manager.load_from_file(str(env_file), format="env")
+
+        result = mem_env_manager.load_env()
+        assert "VALID_KEY" in result
+        assert "NONE_KEY" not in result
+        assert "EMPTY_KEY" in result  # Empty string is not None
+
+    def test_export_to_file_yaml_keeps_order_and_unicode(self, mem_env_manager, temp_config_dir):
+        """Test YAML export keeps the profile's key order and writes non-ASCII as-is."""
+        mem_env_manager.save_env({"ZETA": "last", "ALPHA": "café"})
+        export_file = temp_config_dir / "export.yaml"
+
+        mem_env_manager.export_to_file(str(export_file), format="yaml")
+
+        content = export_file.read_text(encoding="utf-8")
+        assert "café" in content
+        assert list(yaml.load(content, Loader=SafeLoader)) == ["ZETA", "ALPHA"]
+
+    @pytest.mark.parametrize("transform,expected_added,expected_removed,expected_changed", [
+        pytest.param(lambda v: v, {}, {}, {}, id="identical"),
+        pytest.param(
+            lambda v: {**v, "NEW_KEY": "new_value", "ANOTHER_KEY": "another_value"},
+            {"NEW_KEY": "new_value", "ANOTHER_KEY": "another_value"}, {}, {},
+            id="added",
+        ),
+        pytest.param(
+            lambda v: {k: x for k, x in v.items() if k != "API_KEY"},
+            {}, {"API_KEY": "test-api-key-12345"}, {},
+            id="removed",
+        ),
+        pytest.param(
+            lambda v: {**v, "API_KEY": "changed_key", "DEBUG": "false"},
+            {}, {},
+            {
+                "API_KEY": {"old": "test-api-key-12345", "new": "changed_key"},
+                "DEBUG": {"old": "true", "new": "false"}
+            },
+            id="changed",
+        ),
+        pytest.param(
+            lambda v: {**{k: x for k, x in v.items() if k != "DEBUG"},
+                       "API_KEY": "changed_key", "NEW_KEY": "new_value"},
+            {"NEW_KEY": "new_value"}, {"DEBUG": "true"},
+            {"API_KEY": {"old": "test-api-key-12345", "new": "changed_key"}},
+            id="mixed",
+        ),
+    ])
+    def test_diff(self, mem_profiles, sample_env_vars, sample_env_json, transform,
+                  expected_added, expected_removed, expected_changed):
+        """Test diff against a second profile derived from the first."""
+        mem_profiles.set("profile1.json", sample_env_json)
+        mem_profiles.set_json("profile2.json", transform(sample_env_vars))
+
+        manager1 = EnvManager("profile1")
+        result = manager1.diff("profile2")
+
+        expected = {"added": expected_added, "removed": expected_removed, "changed": expected_changed}
+        for section, expected_entries in expected.items():
+            # Compare key views first, then only the entries that should be there
+            assert result[section].keys() == expected_entries.keys()
+            for key, value in expected_entries.items():
+                assert result[section][key] == value
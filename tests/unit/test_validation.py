@@ -1,12 +1,84 @@
+import hashlib
 import json
+from functools import lru_cache
+
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
+
+# Skip at collection, before envcli.validation imports them, if either is missing
+yaml = pytest.importorskip("yaml")
+pytest.importorskip("jsonschema")
+
+from envcli.env_manager import SafeDumper
 from envcli.validation import validate_env_vars, validate_profile
 
 
+# Schemas shared by several tests, looked up by name through schema_files
+SHARED_SCHEMAS = {
+    "required": {
+        "type": "object",
+        "properties": {
+            "API_KEY": {"type": "string"},
+            "DATABASE_URL": {"type": "string"}
+        },
+        "required": ["API_KEY", "DATABASE_URL"]
+    },
+    "integer": {
+        "type": "object",
+        "properties": {
+            "PORT": {"type": "integer"}
+        }
+    },
+    "enum": {
+        "type": "object",
+        "properties": {
+            "ENV": {"type": "string", "enum": ["dev", "staging", "prod"]}
+        }
+    },
+    "pattern": {
+        "type": "object",
+        "properties": {
+            "EMAIL": {"type": "string", "pattern": "^[^@]+@[^@]+\\.[^@]+$"}
+        }
+    },
+    "empty": {"type": "object"},
+    "strict_additional_props": {
+        "type": "object",
+        "properties": {
+            "API_KEY": {"type": "string"}
+        },
+        "additionalProperties": False
+    },
+}
+
+
+@pytest.fixture(scope="session")
+def schema_path(tmp_path_factory):
+    """``schema_path(schema)``: path of a JSON file holding schema.
+
+    Each distinct schema is written once per session and the path reused.
+    """
+    schema_dir = tmp_path_factory.mktemp("schemas")
+
+    @lru_cache(maxsize=None)
+    def _schema_path(spec_json):
+        digest = hashlib.sha256(spec_json.encode("utf-8")).hexdigest()[:16]
+        path = schema_dir / f"s_{digest}.json"
+        path.write_text(spec_json)
+        return path
+
+    return lambda schema: _schema_path(json.dumps(schema, sort_keys=True))
+
+
+@pytest.fixture(scope="class")
+def schema_files(schema_path):
+    """Paths to the SHARED_SCHEMAS files, keyed by name."""
+    return {name: schema_path(schema) for name, schema in SHARED_SCHEMAS.items()}
+
+
 class TestValidation:
-    def test_validate_env_vars_valid_json_schema(self, temp_config_dir):
+    def test_validate_env_vars_valid_json_schema(self, schema_path):
         """Test validating env vars against a valid JSON schema."""
         # Create test schema
         schema = {
@@ -18,9 +90,7 @@ class TestValidation:
             },
             "required": ["API_KEY", "DATABASE_URL"]
         }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
+        schema_file = schema_path(schema)
 
         # Test data that should pass validation
         env_vars = {
@@ -32,10 +102,8 @@ class TestValidation:
         errors = validate_env_vars(env_vars, str(schema_file))
         assert errors == []
 
-    def test_validate_env_vars_valid_yaml_schema(self, temp_config_dir):
+    def test_validate_env_vars_valid_yaml_schema(self, tmp_path):
         """Test validating env vars against a valid YAML schema."""
-        import yaml
-
         # Create test schema
         schema = {
             "type": "object",
@@ -45,9 +113,8 @@ class TestValidation:
             },
             "required": ["API_KEY"]
         }
-        schema_file = temp_config_dir / "schema.yaml"
-        with open(schema_file, 'w') as f:
-            yaml.dump(schema, f)
+        schema_file = tmp_path / "schema.yaml"
+        schema_file.write_text(yaml.dump(schema, Dumper=SafeDumper))
 
         # Test data that should pass validation
         env_vars = {
@@ -58,113 +125,59 @@ class TestValidation:
         errors = validate_env_vars(env_vars, str(schema_file))
         assert errors == []
 
-    def test_validate_env_vars_missing_required_field(self, temp_config_dir):
+    def test_validate_env_vars_missing_required_field(self, schema_files):
         """Test validation fails when required field is missing."""
-        schema = {
-            "type": "object",
-            "properties": {
-                "API_KEY": {"type": "string"},
-                "DATABASE_URL": {"type": "string"}
-            },
-            "required": ["API_KEY", "DATABASE_URL"]
-        }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
         # Missing required DATABASE_URL
         env_vars = {
             "API_KEY": "test-key"
         }
 
-        errors = validate_env_vars(env_vars, str(schema_file))
+        errors = validate_env_vars(env_vars, str(schema_files["required"]))
         assert len(errors) > 0
         assert any("DATABASE_URL" in error for error in errors)
 
-    def test_validate_env_vars_wrong_type(self, temp_config_dir):
+    def test_validate_env_vars_wrong_type(self, schema_files):
         """Test validation fails when field has wrong type."""
-        schema = {
-            "type": "object",
-            "properties": {
-                "PORT": {"type": "integer"}
-            }
-        }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
         # PORT should be integer but is string
         env_vars = {
             "PORT": "8080"
         }
 
-        errors = validate_env_vars(env_vars, str(schema_file))
+        errors = validate_env_vars(env_vars, str(schema_files["integer"]))
         assert len(errors) > 0
         assert any("PORT" in error for error in errors)
 
-    def test_validate_env_vars_enum_violation(self, temp_config_dir):
+    def test_validate_env_vars_enum_violation(self, schema_files):
         """Test validation fails when enum constraint is violated."""
-        schema = {
-            "type": "object",
-            "properties": {
-                "ENV": {"type": "string", "enum": ["dev", "staging", "prod"]}
-            }
-        }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
         # ENV has invalid value
         env_vars = {
             "ENV": "invalid"
         }
 
-        errors = validate_env_vars(env_vars, str(schema_file))
+        errors = validate_env_vars(env_vars, str(schema_files["enum"]))
         assert len(errors) > 0
         assert any("ENV" in error for error in errors)
 
-    def test_validate_env_vars_pattern_violation(self, temp_config_dir):
+    def test_validate_env_vars_pattern_violation(self, schema_files):
         """Test validation fails when pattern constraint is violated."""
-        schema = {
-            "type": "object",
-            "properties": {
-                "EMAIL": {"type": "string", "pattern": "^[^@]+@[^@]+\\.[^@]+$"}
-            }
-        }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
         # EMAIL doesn't match pattern
         env_vars = {
             "EMAIL": "invalid-email"
         }
 
-        errors = validate_env_vars(env_vars, str(schema_file))
+        errors = validate_env_vars(env_vars, str(schema_files["pattern"]))
         assert len(errors) > 0
         assert any("EMAIL" in error for error in errors)
 
-    def test_validate_env_vars_strict_mode(self, temp_config_dir):
+    def test_validate_env_vars_strict_mode(self, schema_files):
         """Test validation in strict mode returns single error."""
-        schema = {
-            "type": "object",
-            "properties": {
-                "API_KEY": {"type": "string"},
-                "DATABASE_URL": {"type": "string"}
-            },
-            "required": ["API_KEY", "DATABASE_URL"]
-        }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
         # Missing both required fields
         env_vars = {}
 
-        errors = validate_env_vars(env_vars, str(schema_file), strict=True)
+        errors = validate_env_vars(env_vars, str(schema_files["required"]), strict=True)
         assert len(errors) == 1  # Only one error in strict mode
 
-    def test_validate_env_vars_non_strict_mode(self, temp_config_dir):
+    def test_validate_env_vars_non_strict_mode(self, schema_path):
         """Test validation in non-strict mode returns multiple errors."""
         schema = {
             "type": "object",
@@ -175,9 +188,7 @@ class TestValidation:
             },
             "required": ["API_KEY", "DATABASE_URL", "PORT"]
         }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
+        schema_file = schema_path(schema)
 
         # Missing all required fields
         env_vars = {}
@@ -185,33 +196,31 @@ class TestValidation:
         errors = validate_env_vars(env_vars, str(schema_file), strict=False)
         assert len(errors) >= 1  # Multiple errors in non-strict mode
 
-    def test_validate_env_vars_schema_not_found(self, temp_config_dir):
+    def test_validate_env_vars_schema_not_found(self, tmp_path):
         """Test validation fails when schema file doesn't exist."""
         env_vars = {"API_KEY": "test"}
-        nonexistent_schema = temp_config_dir / "nonexistent.json"
+        nonexistent_schema = tmp_path / "nonexistent.json"
 
         with pytest.raises(FileNotFoundError, match="Schema file .* not found"):
             validate_env_vars(env_vars, str(nonexistent_schema))
 
-    def test_validate_env_vars_unsupported_format(self, temp_config_dir):
+    def test_validate_env_vars_unsupported_format(self, tmp_path):
         """Test validation fails with unsupported schema format."""
         env_vars = {"API_KEY": "test"}
-        schema_file = temp_config_dir / "schema.txt"
+        schema_file = tmp_path / "schema.txt"
         schema_file.write_text("invalid format")
 
         with pytest.raises(ValueError, match="Schema must be JSON or YAML"):
             validate_env_vars(env_vars, str(schema_file))
 
-    def test_validate_env_vars_json_schema_error(self, temp_config_dir):
+    def test_validate_env_vars_json_schema_error(self, schema_path):
         """Test validation handles JSON schema errors gracefully."""
         # Invalid schema that will cause jsonschema error
         invalid_schema = {
             "type": "invalid_type",
             "properties": {}
         }
-        schema_file = temp_config_dir / "invalid.json"
-        with open(schema_file, 'w') as f:
-            json.dump(invalid_schema, f)
+        schema_file = schema_path(invalid_schema)
 
         env_vars = {"API_KEY": "test"}
 
@@ -220,7 +229,7 @@ class TestValidation:
         assert any("Schema validation error" in error for error in errors)
 
     @patch('envcli.validation.EnvManager')
-    def test_validate_profile(self, mock_env_manager, temp_config_dir):
+    def test_validate_profile(self, mock_env_manager, schema_path):
         """Test validating a profile against schema."""
         # Mock EnvManager
         mock_manager = MagicMock()
@@ -239,9 +248,7 @@ class TestValidation:
             },
             "required": ["API_KEY"]
         }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
+        schema_file = schema_path(schema)
 
         errors = validate_profile("test_profile", str(schema_file))
 
@@ -250,7 +257,7 @@ class TestValidation:
         mock_manager.load_env.assert_called_once()
 
     @patch('envcli.validation.EnvManager')
-    def test_validate_profile_with_errors(self, mock_env_manager, temp_config_dir):
+    def test_validate_profile_with_errors(self, mock_env_manager, schema_files):
         """Test validating a profile that has validation errors."""
         # Mock EnvManager
         mock_manager = MagicMock()
@@ -260,25 +267,12 @@ class TestValidation:
             # Missing DATABASE_URL
         }
 
-        # Create schema requiring DATABASE_URL
-        schema = {
-            "type": "object",
-            "properties": {
-                "API_KEY": {"type": "string"},
-                "DATABASE_URL": {"type": "string"}
-            },
-            "required": ["API_KEY", "DATABASE_URL"]
-        }
-        schema_file = temp_config_dir / "schema.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
-        errors = validate_profile("test_profile", str(schema_file))
+        errors = validate_profile("test_profile", str(schema_files["required"]))
 
         assert len(errors) > 0
         assert any("DATABASE_URL" in error for error in errors)
 
-    def test_validate_env_vars_complex_schema(self, temp_config_dir):
+    def test_validate_env_vars_complex_schema(self, schema_path):
         """Test validation with complex schema including nested objects."""
         schema = {
             "type": "object",
@@ -299,9 +293,7 @@ class TestValidation:
                 }
             }
         }
-        schema_file = temp_config_dir / "complex.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
+        schema_file = schema_path(schema)
 
         # Valid data
         env_vars = {
@@ -317,33 +309,19 @@ class TestValidation:
         # this should produce validation errors
         assert len(errors) > 0
 
-    def test_validate_env_vars_empty_schema(self, temp_config_dir):
+    def test_validate_env_vars_empty_schema(self, schema_files):
         """Test validation with empty schema (should accept anything)."""
-        schema = {"type": "object"}
-        schema_file = temp_config_dir / "empty.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
-
         env_vars = {
             "ANY_KEY": "any_value",
             "ANOTHER_KEY": "another_value"
         }
 
-        errors = validate_env_vars(env_vars, str(schema_file))
+        errors = validate_env_vars(env_vars, str(schema_files["empty"]))
         assert errors == []
 
-    def test_validate_env_vars_additional_properties(self, temp_config_dir):
+    def test_validate_env_vars_additional_properties(self, schema_files):
         """Test validation with additionalProperties constraint."""
-        schema = {
-            "type": "object",
-            "properties": {
-                "API_KEY": {"type": "string"}
-            },
-            "additionalProperties": False
-        }
-        schema_file = temp_config_dir / "strict.json"
-        with open(schema_file, 'w') as f:
-            json.dump(schema, f)
+        schema_file = schema_files["strict_additional_props"]
 
         # Valid: only allowed property
         valid_vars = {"API_KEY": "test"}